@@ -0,0 +1,6 @@
+"""Render-stage microbenchmarks for the invoice apps.
+
+Run ``python -m benchmarks --out results.json`` from the repository root; see
+``benchmarks/__main__.py`` for the options.  Everything runs headless against
+an in-memory SQLite database: no MySQL server and no Tk display are needed.
+"""
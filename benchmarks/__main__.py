@@ -0,0 +1,214 @@
+"""Benchmark the invoice pipeline stage by stage.
+
+    python -m benchmarks                          # 1/50/500/5000 lines, GST on/off
+    python -m benchmarks --sizes 1 50 --out before.json
+    python -m benchmarks --out after.json --compare before.json
+
+For every invoice size and GST setting this times:
+
+* ``totals``     - parsing items and computing line/invoice totals
+* ``words``      - amount in words
+* ``build_pdf``  - the whole web-app PDF, broken down via the renderer's own
+                   stage timers into ``letterhead``, ``table`` and ``save``
+* ``desktop``    - the desktop app's PDF, rendered headlessly
+* ``generate``   - a full ``POST /generate`` (DB write + render) against an
+                   in-memory SQLite database, with ``customer``, ``rollup`` and
+                   ``commit``
+
+plus cold and cached QR encoding once per run.  Each result has the mean,
+median and best time, ops/sec and the peak Python heap of one extra traced
+run.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime
+from decimal import Decimal
+from io import BytesIO
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WEB = os.path.join(ROOT, "invoice-app")
+
+
+def _setup_env(workdir: str) -> None:
+    # must happen before app.py is imported: it reads its config at import
+    os.environ.update({
+        "DATABASE_URL": "sqlite://",
+        "RENDER_WORKERS": "0",                   # render in-process, no pool
+        "METRICS_DIR": os.path.join(workdir, "metrics"),
+        "PDF_CACHE_DIR": os.path.join(workdir, "pdf-cache"),
+        "JOB_QUEUE_PATH": os.path.join(workdir, "jobs.sqlite3"),
+        "JOB_OUTPUT_DIR": os.path.join(workdir, "jobs"),
+    })
+    for path in (ROOT, WEB):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+
+def timeit(fn, min_time: float, max_runs: int) -> dict:
+    """Call ``fn`` until ``min_time`` seconds or ``max_runs`` calls have passed,
+    after one untimed warm-up call."""
+    fn()                                         # warm caches and lazy imports
+    times = []
+    deadline = time.perf_counter() + min_time
+    while len(times) < max_runs and (not times or time.perf_counter() < deadline):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    mean = statistics.fmean(times)
+    return {"runs": len(times), "mean_s": mean, "median_s": statistics.median(times),
+            "min_s": min(times), "ops_per_sec": 1 / mean if mean else None,
+            "peak_mem_bytes": peak}
+
+
+def _stage_sums(metrics) -> dict:
+    hist, _counters = metrics.collect()
+    return {stage: (values[-1], sum(values[:-1])) for stage, values in hist.items()}
+
+
+def _stage_means(before: dict, after: dict, stages) -> dict:
+    out = {}
+    for stage in stages:
+        s0, n0 = before.get(stage, (0.0, 0))
+        s1, n1 = after.get(stage, (0.0, 0))
+        if n1 > n0:
+            out[stage] = (s1 - s0) / (n1 - n0)
+    return out
+
+
+def run(sizes, min_time: float, max_runs: int) -> dict:
+    with tempfile.TemporaryDirectory() as workdir:
+        _setup_env(workdir)
+        import app as web
+        import invoice_generator as desktop
+        import render
+        from metrics import METRICS
+        from invoice_core.qr import QRCache, QR_CACHE
+        from invoice_core.words import amount_in_words, rupees_in_words
+        from benchmarks.synthetic import make_invoice
+
+        with web.APP.app_context():
+            web.db.create_all()
+        client = web.APP.test_client()
+        results = []
+
+        def record(case: str, stage: str, stats: dict, **extra) -> None:
+            results.append({"case": case, "stage": stage, **extra, **stats})
+            print(f"{case:>12} {stage:<10} {stats['mean_s'] * 1000:10.2f} ms"
+                  f" {stats['ops_per_sec']:10.1f} ops/s {stats['peak_mem_bytes'] / 1e6:8.2f} MB")
+
+        record("qr", "encode", timeit(lambda: QRCache().modules(render.SHOP_QR, 1),
+                                      min_time, max_runs * 10))
+        QR_CACHE.warm(render.SHOP_QR, box_size=3, border=1)
+        record("qr", "cached", timeit(lambda: QR_CACHE.modules(render.SHOP_QR, 1),
+                                      min_time, max_runs * 100))
+
+        for n in sizes:
+            for with_gst in (True, False):
+                case = f"{n}-{'gst' if with_gst else 'nogst'}"
+                meta = {"lines": n, "gst": with_gst}
+                payload = make_invoice(n, with_gst, seed=n)
+                items, cust = payload["items"], payload["customer"]
+
+                record(case, "totals", timeit(lambda: render.invoice_lines(items, with_gst),
+                                              min_time, max_runs), **meta)
+                lines, totals = render.invoice_lines(items, with_gst)
+                def words():
+                    # a new amount: the whole-amount caches would make this a dict lookup
+                    rupees_in_words.cache_clear()
+                    amount_in_words.cache_clear()
+                    amount_in_words(totals.total)
+                record(case, "words", timeit(words, min_time, max_runs), **meta)
+
+                desc = web._describe("0001", cust, lines, totals, with_gst, date.today())
+                before = _stage_sums(METRICS)
+                stats = timeit(lambda: render.render_invoice(desc), min_time, max_runs)
+                stats["stages"] = _stage_means(before, _stage_sums(METRICS),
+                                               ("letterhead", "table", "words", "save"))
+                record(case, "build_pdf", stats, **meta)
+
+                gst = Decimal(18 if with_gst else 0)
+                desk_lines = [desktop.item_line(i, it["desc"], it["hsn"], Decimal(it["qty"]),
+                                                Decimal(it["rate"]), gst)
+                              for i, it in enumerate(items, 1)]
+                desk_pdf = desktop.InvoicePdf()
+                desk_inv = desktop.desktop_invoice(1, cust, desk_lines)
+                record(case, "desktop", timeit(
+                    lambda: desk_pdf.render(BytesIO(), desk_inv),
+                    min_time, max_runs), **meta)
+
+                form = {"payload": json.dumps(payload)}
+                def generate():
+                    r = client.post("/generate", data=form)
+                    assert r.status_code == 200, r.status_code
+                before = _stage_sums(METRICS)
+                stats = timeit(generate, min_time, max_runs)
+                stats["stages"] = _stage_means(
+                    before, _stage_sums(METRICS),
+                    ("parse", "totals", "number", "customer", "rollup", "commit", "render"))
+                record(case, "generate", stats, **meta)
+
+    import reportlab
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "reportlab": reportlab.Version,
+            "sizes": list(sizes),
+            "min_time": min_time,
+            "max_runs": max_runs,
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict) -> None:
+    """Print the speed-up of ``current`` over ``baseline`` per case and stage."""
+    old = {(r["case"], r["stage"]): r for r in baseline["results"]}
+    print(f"\n{'case':>12} {'stage':<10} {'before ms':>10} {'after ms':>10} {'speed-up':>9}")
+    for r in current["results"]:
+        b = old.get((r["case"], r["stage"]))
+        if b is None:
+            continue
+        print(f"{r['case']:>12} {r['stage']:<10} {b['mean_s'] * 1000:10.2f}"
+              f" {r['mean_s'] * 1000:10.2f} {b['mean_s'] / r['mean_s']:8.2f}x")
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.split("\n")[0])
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1, 50, 500, 5000],
+                    help="line-item counts to benchmark (default: 1 50 500 5000)")
+    ap.add_argument("--min-time", type=float, default=1.0,
+                    help="seconds to spend on each measurement (default: 1.0)")
+    ap.add_argument("--max-runs", type=int, default=50,
+                    help="upper bound on calls per measurement (default: 50)")
+    ap.add_argument("--out", help="write the results to this JSON file")
+    ap.add_argument("--compare", metavar="BASELINE", help="JSON file from an earlier run")
+    args = ap.parse_args(argv)
+
+    results = run(args.sizes, args.min_time, args.max_runs)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nWrote {args.out}")
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
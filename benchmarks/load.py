@@ -0,0 +1,317 @@
+"""Load-test the web app end to end under gunicorn.
+
+    python -m benchmarks.load                            # 4 workers, 16 clients
+    python -m benchmarks.load --workers 8 --clients 32 --requests 2000
+    python -m benchmarks.load --number-block 20 --out load.json
+
+Starts ``invoice-app`` under gunicorn against a fresh SQLite file, posts
+synthetic invoices to ``POST /generate`` from concurrent clients and reports
+p50/p95/p99 latency, throughput and the error rate, plus the mean time the
+workers spent in each server-side stage.  Afterwards it checks the database:
+
+* every invoice number is unique, was handed out once, and - with gapless
+  numbering - the numbers are consecutive;
+* the subtotal, CGST, SGST and grand total stored for each invoice are the
+  ones printed on the PDF the client received.  This reads the PDF text
+  with ``pypdf``, an optional extra (``pip install pypdf``); without it the
+  check is skipped.
+
+The exit status is 1 if any check fails.
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+import random
+import re
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+from benchmarks.synthetic import make_customer, make_invoice
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WEB = os.path.join(ROOT, "invoice-app")
+
+FILENAME = re.compile(r'filename="?invoice_(\w+)\.pdf')
+PRINTED = {                                      # PDF label -> invoice column
+    "Subtotal": "subtotal",
+    "CGST @ 9%": "cgst",
+    "SGST @ 9%": "sgst",
+    "Grand Total": "total",
+}
+
+
+# ---------- server --------------------------------------------------
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _server_env(workdir: str, args) -> dict:
+    env = dict(os.environ)
+    env.update({
+        "DATABASE_URL": f"sqlite:///{os.path.join(workdir, 'invoices.db')}",
+        "METRICS_DIR": os.path.join(workdir, "metrics"),
+        "PDF_CACHE_DIR": os.path.join(workdir, "pdf-cache"),
+        "JOB_QUEUE_PATH": os.path.join(workdir, "jobs.sqlite3"),
+        "JOB_OUTPUT_DIR": os.path.join(workdir, "jobs"),
+        "INVOICE_NUMBER_BLOCK": str(args.number_block),
+        "PYTHONPATH": os.pathsep.join(filter(None, (ROOT, env.get("PYTHONPATH")))),
+    })
+    if args.render_workers is not None:
+        env["RENDER_WORKERS"] = str(args.render_workers)
+    return env
+
+
+def start_server(workdir: str, port: int, args):
+    """Create the tables, start gunicorn and wait until it answers."""
+    env = _server_env(workdir, args)
+    subprocess.run([sys.executable, "-m", "flask", "--app", "app", "init-db"],
+                   cwd=WEB, env=env, check=True, stdout=subprocess.DEVNULL)
+    log = open(os.path.join(workdir, "gunicorn.log"), "wb")
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "--config", "gunicorn.conf.py",
+         "--workers", str(args.workers),
+         "--bind", f"127.0.0.1:{port}", "--timeout", "120", "app:APP"],
+        cwd=WEB, env=env, stdout=log, stderr=subprocess.STDOUT)
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            with open(log.name, errors="replace") as f:
+                tail = f.read()[-2000:]
+            raise SystemExit(f"gunicorn exited with {proc.returncode}:\n{tail}")
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=1).close()
+            return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.terminate()
+    raise SystemExit("gunicorn did not start within 60 seconds")
+
+
+def stop_server(proc) -> None:
+    proc.terminate()
+    try:
+        proc.wait(30)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+# ---------- client --------------------------------------------------
+def make_payloads(n: int, sizes, customers: int, gst_share: float, seed: int) -> list:
+    """``n`` invoices with sizes drawn from ``sizes`` and repeat customers."""
+    rng = random.Random(seed)
+    payloads = []
+    for i in range(n):
+        payload = make_invoice(rng.choice(sizes), rng.random() < gst_share, seed, i)
+        j = rng.randrange(customers)
+        payload["customer"] = make_customer(random.Random(f"{seed}-customer-{j}"), j)
+        payloads.append(payload)
+    return payloads
+
+
+def post(url: str, payload: dict, pdf_dir: str) -> dict:
+    """POST one invoice; keep the PDF under ``pdf_dir`` and time the request."""
+    body = urllib.parse.urlencode({"payload": json.dumps(payload)}).encode()
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(url, body, timeout=120) as r:
+            pdf, status = r.read(), r.status
+            disposition = r.headers.get("Content-Disposition", "")
+    except urllib.error.HTTPError as e:
+        e.read()
+        return {"status": e.code, "seconds": time.perf_counter() - start}
+    except OSError as e:
+        return {"status": 0, "seconds": time.perf_counter() - start, "error": str(e)}
+    seconds = time.perf_counter() - start
+    m = FILENAME.search(disposition)
+    inv_no = m.group(1) if m else None
+    if inv_no is not None:
+        # the number may be handed out twice: keep every copy
+        path = os.path.join(pdf_dir, f"{inv_no}-{os.urandom(4).hex()}.pdf")
+        with open(path, "wb") as f:
+            f.write(pdf)
+    return {"status": status, "seconds": seconds, "invoice_no": inv_no}
+
+
+def percentile(sorted_values: list, p: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return float("nan")
+    k = max(0, min(len(sorted_values) - 1, round(p / 100 * len(sorted_values) + 0.5) - 1))
+    return sorted_values[k]
+
+
+# ---------- checks --------------------------------------------------
+def check_numbers(db_path: str, responses: list, gapless: bool) -> dict:
+    issued = [r["invoice_no"] for r in responses if r.get("invoice_no")]
+    with sqlite3.connect(db_path) as conn:
+        stored = [row[0] for row in conn.execute("SELECT invoice_no FROM invoice")]
+    numbers = sorted(int(n) for n in stored)
+    gaps = (numbers[-1] - numbers[0] + 1 - len(set(numbers))) if numbers else 0
+    result = {
+        "stored": len(stored),
+        "duplicate_responses": len(issued) - len(set(issued)),
+        "duplicate_rows": len(stored) - len(set(stored)),
+        "missing_rows": len(set(issued) - set(stored)),
+        "gaps": gaps,
+    }
+    result["ok"] = not (result["duplicate_responses"] or result["duplicate_rows"]
+                        or result["missing_rows"] or (gapless and gaps))
+    return result
+
+
+def _printed_totals(path: str) -> dict:
+    from pypdf import PdfReader
+
+    text = PdfReader(path).pages[-1].extract_text()
+    out = {}
+    for label, column in PRINTED.items():
+        m = re.search(re.escape(label) + r"\s+(-?\d+\.\d\d)", text)
+        if m:
+            out[column] = m.group(1)
+    return out
+
+
+def check_totals(db_path: str, pdf_dir: str) -> dict:
+    try:
+        import pypdf  # noqa: F401
+    except ImportError:
+        return {"ok": True, "skipped": "pypdf is not installed (pip install pypdf)"}
+    with sqlite3.connect(db_path) as conn:
+        rows = conn.execute("SELECT invoice_no, subtotal, cgst, sgst, total FROM invoice")
+        stored = {no: {"subtotal": sub, "cgst": cgst, "sgst": sgst, "total": total}
+                  for no, sub, cgst, sgst, total in rows}
+    checked, mismatches = 0, []
+    for name in sorted(os.listdir(pdf_dir)):
+        inv_no = name.split("-")[0]
+        row = stored.get(inv_no)
+        printed = _printed_totals(os.path.join(pdf_dir, name))
+        checked += 1
+        # SQLite hands Numeric columns back as floats
+        bad = {col: (value, None if row is None else row[col])
+               for col, value in printed.items()
+               if row is None or row[col] is None or f"{row[col]:.2f}" != value}
+        if bad or "total" not in printed:
+            mismatches.append({"invoice_no": inv_no, "printed_vs_stored": bad})
+    return {"ok": not mismatches, "checked": checked, "mismatches": mismatches[:20],
+            "mismatch_count": len(mismatches)}
+
+
+def server_stages(workdir: str) -> dict:
+    """Mean seconds per server-side stage, from the workers' metric files."""
+    if WEB not in sys.path:
+        sys.path.insert(0, WEB)
+    from metrics import Registry
+
+    hist, _counters = Registry(os.path.join(workdir, "metrics")).collect()
+    return {stage: values[-1] / sum(values[:-1])
+            for stage, values in sorted(hist.items()) if sum(values[:-1])}
+
+
+# ---------- main ----------------------------------------------------
+def run(args, workdir: str) -> dict:
+    pdf_dir = os.path.join(workdir, "pdfs")
+    os.makedirs(pdf_dir, exist_ok=True)
+    payloads = make_payloads(args.requests, args.lines, args.customers,
+                             args.gst_share, args.seed)
+    port = _free_port()
+    proc = start_server(workdir, port, args)
+    url = f"http://127.0.0.1:{port}/generate"
+    try:
+        print(f"{args.requests} invoices from {args.clients} clients "
+              f"to {args.workers} gunicorn workers...")
+        start = time.perf_counter()
+        with ThreadPoolExecutor(args.clients) as pool:
+            responses = list(pool.map(lambda p: post(url, p, pdf_dir), payloads))
+        elapsed = time.perf_counter() - start
+    finally:
+        stop_server(proc)
+
+    ok = sorted(r["seconds"] for r in responses if r["status"] == 200)
+    statuses = {}
+    for r in responses:
+        statuses[str(r["status"])] = statuses.get(str(r["status"]), 0) + 1
+    db_path = os.path.join(workdir, "invoices.db")
+    return {
+        "config": {k: v for k, v in vars(args).items() if k not in ("out", "workdir")},
+        "elapsed_s": elapsed,
+        "throughput_per_s": len(ok) / elapsed,
+        "error_rate": 1 - len(ok) / len(responses),
+        "statuses": statuses,
+        "latency_s": {"p50": percentile(ok, 50), "p95": percentile(ok, 95),
+                      "p99": percentile(ok, 99), "max": ok[-1] if ok else None},
+        "server_stages_s": server_stages(workdir),
+        "numbers": check_numbers(db_path, responses, gapless=not args.number_block),
+        "totals": check_totals(db_path, pdf_dir),
+    }
+
+
+def report(result: dict) -> None:
+    lat = result["latency_s"]
+    print(f"throughput {result['throughput_per_s']:.1f} invoices/s, "
+          f"error rate {result['error_rate']:.2%}, statuses {result['statuses']}")
+    print("latency    " + ", ".join(f"{k} {v * 1000:.1f} ms" for k, v in lat.items()
+                                    if v is not None))
+    print("server     " + ", ".join(f"{k} {v * 1000:.1f} ms"
+                                    for k, v in result["server_stages_s"].items()))
+    n = result["numbers"]
+    print(f"numbers    {'OK' if n['ok'] else 'FAILED'}: {n['stored']} stored, "
+          f"{n['duplicate_responses']} handed out twice, {n['missing_rows']} missing, "
+          f"{n['gaps']} gaps")
+    t = result["totals"]
+    if "skipped" in t:
+        print(f"totals     skipped: {t['skipped']}")
+    else:
+        print(f"totals     {'OK' if t['ok'] else 'FAILED'}: {t['checked']} PDFs checked, "
+              f"{t['mismatch_count']} mismatched")
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m benchmarks.load",
+                                 description=__doc__.split("\n")[0])
+    ap.add_argument("--workers", type=int, default=4, help="gunicorn workers (default: 4)")
+    ap.add_argument("--render-workers", type=int,
+                    help="RENDER_WORKERS for each gunicorn worker (default: the app's)")
+    ap.add_argument("--clients", type=int, default=16,
+                    help="concurrent client connections (default: 16)")
+    ap.add_argument("--requests", type=int, default=500,
+                    help="invoices to post (default: 500)")
+    ap.add_argument("--lines", type=int, nargs="+", default=[1, 2, 3, 5, 8, 12, 25],
+                    help="line counts drawn from for each invoice")
+    ap.add_argument("--customers", type=int, default=200,
+                    help="distinct customers, so most invoices are for repeat ones")
+    ap.add_argument("--gst-share", type=float, default=0.8,
+                    help="fraction of invoices with GST (default: 0.8)")
+    ap.add_argument("--number-block", type=int, default=0,
+                    help="INVOICE_NUMBER_BLOCK; gaps are only an error when 0")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--workdir", help="keep the database, PDFs and gunicorn log here")
+    ap.add_argument("--out", help="write the results to this JSON file")
+    args = ap.parse_args(argv)
+
+    if args.workdir:
+        os.makedirs(args.workdir, exist_ok=True)
+        result = run(args, args.workdir)
+    else:
+        with tempfile.TemporaryDirectory() as workdir:
+            result = run(args, workdir)
+    report(result)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"\nWrote {args.out}")
+    return 0 if result["numbers"]["ok"] and result["totals"]["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
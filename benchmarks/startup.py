@@ -0,0 +1,181 @@
+"""Start-up time of both apps, measured in fresh interpreters.
+
+    python -m benchmarks.startup --out startup.json
+    python -m benchmarks.startup --compare startup.json --fail-over 1.25
+
+Each run starts a new Python process and reports:
+
+* ``web``      ``import`` of app.py (including ``render.warm_up``), then the
+               ``first_pdf`` and ``second_pdf`` rendered in that process;
+               the gap between the two is work the warm-up missed
+* ``desktop``  ``import`` of invoice_generator.py, ``window`` until the Tk
+               window is built and drawn (skipped without a display) and
+               ``first_pdf`` including the deferred ReportLab imports
+
+plus ``process``, the wall time of the whole child including interpreter
+start-up.  Results use the same JSON layout as ``python -m benchmarks``;
+``--fail-over`` exits with status 1 when a stage got slower than the baseline
+by more than the given factor, so CI notices start-up regressions.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from benchmarks.__main__ import compare
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WEB = os.path.join(ROOT, "invoice-app")
+
+WEB_CHILD = """
+import json, time
+from datetime import date
+t0 = time.perf_counter()
+import app
+t1 = time.perf_counter()
+from render import render_invoice
+from benchmarks.synthetic import make_invoice
+payload = make_invoice(5, True)
+lines, totals = app.invoice_lines(payload["items"], True)
+desc = app._describe("0001", payload["customer"], lines, totals, True, date.today())
+t2 = time.perf_counter()
+render_invoice(desc)
+t3 = time.perf_counter()
+render_invoice(desc)
+t4 = time.perf_counter()
+print(json.dumps({"import": t1 - t0, "first_pdf": t3 - t2, "second_pdf": t4 - t3}))
+"""
+
+DESKTOP_CHILD = """
+import json, os, sys, time
+t0 = time.perf_counter()
+import invoice_generator as ig
+t1 = time.perf_counter()
+out = {"import": t1 - t0}
+import tkinter as tk
+try:
+    root = tk.Tk()
+except tk.TclError:
+    root = None
+if root is not None:
+    t1 = time.perf_counter()
+    gui = ig.InvoiceGenerator(root)
+    root.update()
+    out["window"] = time.perf_counter() - t1
+    root.destroy()
+
+from decimal import Decimal
+lines = [ig.item_line(i + 1, "Glow plug", "8511", Decimal(1), Decimal("450"), Decimal(18))
+         for i in range(5)]
+customer = {"name": "Customer", "address": "", "vehicle": "", "jobcard": "", "po": ""}
+os.chdir(sys.argv[1])
+t1 = time.perf_counter()
+ig.InvoicePdf().render("invoice_0001.pdf", ig.desktop_invoice(1, customer, lines))
+out["first_pdf"] = time.perf_counter() - t1
+print(json.dumps(out))
+"""
+
+
+def _env(workdir: str) -> dict:
+    env = dict(os.environ)
+    env.update({
+        "DATABASE_URL": "sqlite://",
+        "RENDER_WORKERS": "0",
+        "METRICS_DIR": os.path.join(workdir, "metrics"),
+        "PDF_CACHE_DIR": os.path.join(workdir, "pdf-cache"),
+        "JOB_QUEUE_PATH": os.path.join(workdir, "jobs.sqlite3"),
+        "JOB_OUTPUT_DIR": os.path.join(workdir, "jobs"),
+        "INVOICE_LEDGER": os.path.join(workdir, "invoices.sqlite3"),
+        "PYTHONPATH": os.pathsep.join(filter(None, (ROOT, WEB, env.get("PYTHONPATH")))),
+    })
+    return env
+
+
+def _child(code: str, workdir: str) -> dict:
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-c", code, workdir], cwd=ROOT, env=_env(workdir),
+                          capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if proc.returncode:
+        raise SystemExit(proc.stderr)
+    stages = json.loads(proc.stdout.strip().splitlines()[-1])
+    stages["process"] = elapsed
+    return stages
+
+
+def _stats(times: list) -> dict:
+    return {"runs": len(times), "mean_s": statistics.fmean(times),
+            "median_s": statistics.median(times), "min_s": min(times)}
+
+
+def run(runs: int) -> dict:
+    results = []
+    for case, code in (("web", WEB_CHILD), ("desktop", DESKTOP_CHILD)):
+        samples = {}
+        for _ in range(runs):
+            with tempfile.TemporaryDirectory() as workdir:
+                for stage, seconds in _child(code, workdir).items():
+                    samples.setdefault(stage, []).append(seconds)
+        for stage, times in samples.items():
+            stats = _stats(times)
+            results.append({"case": case, "stage": stage, **stats})
+            print(f"{case:>12} {stage:<10} {stats['mean_s'] * 1000:10.1f} ms"
+                  f" (median {stats['median_s'] * 1000:.1f}, best {stats['min_s'] * 1000:.1f})")
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "runs": runs,
+        },
+        "results": results,
+    }
+
+
+def regressions(current: dict, baseline: dict, factor: float) -> list:
+    """``(case, stage, ratio)`` for every stage more than ``factor`` slower."""
+    old = {(r["case"], r["stage"]): r["mean_s"] for r in baseline["results"]}
+    out = []
+    for r in current["results"]:
+        before = old.get((r["case"], r["stage"]))
+        if before and r["mean_s"] / before > factor:
+            out.append((r["case"], r["stage"], r["mean_s"] / before))
+    return out
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m benchmarks.startup",
+                                 description=__doc__.split("\n")[0])
+    ap.add_argument("--runs", type=int, default=5,
+                    help="fresh processes per app (default: 5)")
+    ap.add_argument("--out", help="write the results to this JSON file")
+    ap.add_argument("--compare", metavar="BASELINE", help="JSON file from an earlier run")
+    ap.add_argument("--fail-over", type=float, metavar="FACTOR",
+                    help="with --compare, exit 1 if a stage is this many times slower")
+    args = ap.parse_args(argv)
+
+    results = run(args.runs)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nWrote {args.out}")
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        compare(results, baseline)
+        if args.fail_over:
+            slow = regressions(results, baseline, args.fail_over)
+            for case, stage, ratio in slow:
+                print(f"REGRESSION: {case} {stage} is {ratio:.2f}x slower")
+            return 1 if slow else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
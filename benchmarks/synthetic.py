@@ -0,0 +1,41 @@
+"""Deterministic synthetic invoices for benchmarks and load tests."""
+import random
+
+PARTS = (
+    ("Alternator brush set", "8511"), ("Starter motor solenoid", "8511"),
+    ("Fuel injection pump service", "9987"), ("Glow plug", "8511"),
+    ("Nozzle holder assembly", "8409"), ("Wiring harness repair", "9987"),
+    ("Battery terminal clamp", "8536"), ("Headlamp relay", "8536"),
+    ("Voltage regulator", "9032"), ("AMC preventive maintenance visit", "9987"),
+)
+
+DISTRICTS = ("Krishna", "Guntur", "West Godavari", "NTR", "Eluru")
+
+
+def make_customer(rng: random.Random, i: int = 0) -> dict:
+    return {
+        "name": f"Customer {i:05d}",
+        "phone": f"9{rng.randrange(10**9):09d}",
+        "address": f"{rng.randint(1, 99)}-{rng.randint(1, 400)} Main Road",
+        "district": rng.choice(DISTRICTS),
+        "state": "Andhra Pradesh",
+        "vehicle": f"AP{rng.randint(1, 39):02d} T{rng.choice('ABCDEFGH')} {rng.randint(1000, 9999)}",
+        "jobcard": f"JC-{rng.randint(1, 99999)}",
+    }
+
+
+def make_items(n: int, rng: random.Random) -> list:
+    """``n`` line items with 2-decimal rates and mostly whole quantities."""
+    items = []
+    for i in range(n):
+        desc, hsn = PARTS[i % len(PARTS)]
+        qty = rng.choice(("1", "1", "2", "3", "4", "0.5", "1.25"))
+        rate = f"{rng.randint(50, 250000) / 100:.2f}"
+        items.append({"desc": f"{desc} #{i + 1}", "hsn": hsn, "qty": qty, "rate": rate})
+    return items
+
+
+def make_invoice(n: int, with_gst: bool = True, seed: int = 0, i: int = 0) -> dict:
+    """One ``/generate`` payload with ``n`` lines."""
+    rng = random.Random(f"{seed}-{n}-{i}")
+    return {"customer": make_customer(rng, i), "items": make_items(n, rng), "with_gst": with_gst}
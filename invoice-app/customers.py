@@ -0,0 +1,79 @@
+"""Customer upserts keyed by a normalized phone number.
+
+Each customer row has a unique ``phone_key`` (the last ten digits of the
+phone number), so finding a customer is an index lookup.  ``CustomerStore``
+writes the row with a single native upsert (``ON DUPLICATE KEY UPDATE`` on
+MySQL, ``ON CONFLICT`` on SQLite/PostgreSQL).
+
+The database is always asked: another worker may have changed the row
+since this process last saw it, so a remembered id and snapshot prove nothing.
+"""
+import re
+from typing import Optional
+
+from sqlalchemy import func, insert, or_, select, update
+
+FIELDS = ("name", "phone", "address", "location", "vehicle_no")
+
+
+def normalize_phone(raw) -> Optional[str]:
+    """``"+91 99585-92564"`` -> ``"9958592564"``; ``None`` when no digits."""
+    digits = re.sub(r"\D", "", str(raw or ""))
+    if len(digits) > 10 and digits.startswith(("91", "0")):
+        digits = digits[-10:]                    # drop trunk / country prefix
+    return digits or None
+
+
+class CustomerStore:
+    """Upserts customers into ``table``."""
+
+    def __init__(self, table):
+        self.table = table
+
+    def upsert(self, session, values: dict) -> int:
+        """Insert or update the customer described by ``values`` (the columns
+        in ``FIELDS``) and return its id."""
+        key = normalize_phone(values.get("phone"))
+        values = {f: values[f] for f in FIELDS if f in values}
+        if key is None:
+            # no phone: nothing to match on, every invoice gets its own row
+            return session.execute(insert(self.table).values(values)).inserted_primary_key[0]
+        return self._write(session.connection(), key, values)
+
+    def _write(self, conn, key: str, values: dict) -> int:
+        t = self.table
+        row = dict(values, phone_key=key)
+        dialect = conn.dialect.name
+        if dialect == "mysql":
+            from sqlalchemy.dialects.mysql import insert as mysql_insert
+            stmt = mysql_insert(t).values(row)
+            # LAST_INSERT_ID(id) makes lastrowid the existing id on a duplicate;
+            # MySQL leaves the row alone when every value is unchanged
+            stmt = stmt.on_duplicate_key_update(
+                id=func.last_insert_id(t.c.id),
+                **{f: stmt.inserted[f] for f in values})
+            return conn.execute(stmt).lastrowid
+        if dialect in ("sqlite", "postgresql"):
+            if dialect == "sqlite":
+                from sqlalchemy.dialects.sqlite import insert as dialect_insert
+            else:
+                from sqlalchemy.dialects.postgresql import insert as dialect_insert
+            stmt = dialect_insert(t).values(row)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[t.c.phone_key],
+                set_={f: stmt.excluded[f] for f in values},
+                # only write when something actually changed
+                where=or_(*(t.c[f].is_distinct_from(stmt.excluded[f]) for f in values)),
+            ).returning(t.c.id)
+            cust_id = conn.execute(stmt).scalar()
+            if cust_id is None:                  # conflict, but nothing to update
+                cust_id = conn.execute(select(t.c.id).where(t.c.phone_key == key)).scalar_one()
+            return cust_id
+        # any other backend: indexed read, then insert or update
+        found = conn.execute(select(t.c.id, *(t.c[f] for f in values))
+                             .where(t.c.phone_key == key)).first()
+        if found is None:
+            return conn.execute(insert(t).values(row)).inserted_primary_key[0]
+        if any(found._mapping[f] != v for f, v in values.items()):
+            conn.execute(update(t).where(t.c.id == found.id).values(values))
+        return found.id
@@ -0,0 +1,17 @@
+"""gunicorn settings: ``gunicorn -c gunicorn.conf.py app:APP``.
+
+The app is imported once in the master (``preload_app``), so Flask,
+SQLAlchemy and ReportLab are loaded and ``render.warm_up`` has built the shop
+QR, font metrics and letterhead before any worker is forked.  Workers start
+with all of it already in (copy-on-write) memory instead of paying for it on
+their first request.  Worker count comes from ``--workers`` or
+``WEB_CONCURRENCY`` as usual.
+"""
+preload_app = True
+
+
+def post_fork(server, worker):
+    # a connection the master opened must not be shared with the workers
+    from app import APP, db
+    with APP.app_context():
+        db.engine.dispose(close=False)
@@ -0,0 +1,176 @@
+"""Durable local queue of PDF render jobs.
+
+``POST /generate`` in async mode saves the invoice, drops its description into
+this queue and answers straight away with a job id; ``flask jobs-worker``
+renders queued jobs in the background.  The queue is one SQLite table next to
+the app, so queued work survives restarts of both the web server and the
+worker, and finished PDFs are written to ``output_dir``.
+
+A job is ``queued`` -> ``running`` -> ``done`` (or ``failed`` once it has
+used up ``max_attempts``).  A running job whose worker disappeared is picked
+up again after ``lease`` seconds.
+"""
+from contextlib import closing
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import uuid
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS render_job (
+    id          TEXT PRIMARY KEY,
+    invoice_no  TEXT NOT NULL,
+    status      TEXT NOT NULL,
+    payload     BLOB NOT NULL,
+    attempts    INTEGER NOT NULL DEFAULT 0,
+    error       TEXT,
+    created     REAL NOT NULL,
+    started     REAL,
+    finished    REAL
+);
+CREATE INDEX IF NOT EXISTS ix_render_job_status ON render_job (status, created);
+"""
+
+
+class JobQueue:
+    """Render jobs stored in the SQLite database at ``path``."""
+
+    def __init__(self, path: str, output_dir: str, lease: float = 120, max_attempts: int = 3):
+        self.path = path
+        self.output_dir = output_dir
+        self.lease = lease
+        self.max_attempts = max_attempts
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        os.makedirs(output_dir, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    # ---------- web side -------------------------------------------
+    def put(self, invoice_no: str, desc) -> str:
+        """Queue the ``Invoice`` ``desc`` (see ``_describe`` in app.py) and return
+        the job id."""
+        job_id = uuid.uuid4().hex
+        # the queue is a private local file, so pickle is fine for the payload
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "INSERT INTO render_job (id, invoice_no, status, payload, created)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (job_id, invoice_no, QUEUED, pickle.dumps(desc), time.time()))
+        return job_id
+
+    def get(self, job_id: str):
+        """Status row for ``job_id`` as a dict, or ``None``."""
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT id, invoice_no, status, attempts, error, created, started, finished"
+                " FROM render_job WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row is not None else None
+
+    def pdf_path(self, job_id: str) -> str:
+        return os.path.join(self.output_dir, f"{job_id}.pdf")
+
+    # ---------- worker side ----------------------------------------
+    def claim(self):
+        """Take the oldest runnable job; returns ``(job_id, desc)`` or ``None``."""
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT id, payload FROM render_job"
+                    " WHERE status = ? OR (status = ? AND started < ?)"
+                    " ORDER BY created LIMIT 1",
+                    (QUEUED, RUNNING, now - self.lease)).fetchone()
+                if row is not None:
+                    conn.execute(
+                        "UPDATE render_job SET status = ?, started = ?, attempts = attempts + 1"
+                        " WHERE id = ?", (RUNNING, now, row["id"]))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return (row["id"], pickle.loads(row["payload"])) if row is not None else None
+
+    def finish(self, job_id: str, pdf: bytes) -> None:
+        path = self.pdf_path(job_id)
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(pdf)
+        os.replace(tmp, path)
+        with closing(self._connect()) as conn:
+            conn.execute("UPDATE render_job SET status = ?, error = NULL, finished = ? WHERE id = ?",
+                         (DONE, time.time(), job_id))
+
+    def fail(self, job_id: str, error: str) -> None:
+        """Record a failed attempt; the job is retried until ``max_attempts``."""
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "UPDATE render_job SET error = ?,"
+                " status = CASE WHEN attempts < ? THEN ? ELSE ? END,"
+                " finished = CASE WHEN attempts < ? THEN NULL ELSE ? END"
+                " WHERE id = ?",
+                (error, self.max_attempts, QUEUED, FAILED, self.max_attempts, time.time(), job_id))
+
+    def purge(self, max_age: float) -> int:
+        """Forget finished jobs (and their PDFs) older than ``max_age`` seconds."""
+        cutoff = time.time() - max_age
+        with closing(self._connect()) as conn:
+            ids = [r["id"] for r in conn.execute(
+                "SELECT id FROM render_job WHERE status IN (?, ?) AND finished < ?",
+                (DONE, FAILED, cutoff))]
+            conn.executemany("DELETE FROM render_job WHERE id = ?", [(i,) for i in ids])
+        for job_id in ids:
+            try:
+                os.remove(self.pdf_path(job_id))
+            except FileNotFoundError:
+                pass
+        return len(ids)
+
+
+def run_worker(queue: JobQueue, render, concurrency: int = 1, poll: float = 1.0,
+               retention: float = 7 * 86400, stop: threading.Event = None) -> None:
+    """Drain ``queue`` with ``concurrency`` threads until ``stop`` is set.
+
+    ``render(desc) -> bytes`` does the actual work; with a ``RenderEngine``
+    behind it the threads only wait while worker processes render.
+    """
+    stop = stop or threading.Event()
+
+    def drain():
+        while not stop.is_set():
+            job = queue.claim()
+            if job is None:
+                stop.wait(poll)
+                continue
+            job_id, desc = job
+            try:
+                pdf = render(desc)
+            except Exception as e:
+                print(f"Job {job_id} failed: {e}")
+                queue.fail(job_id, str(e))
+            else:
+                queue.finish(job_id, pdf)
+
+    threads = [threading.Thread(target=drain, name=f"jobs-{i}", daemon=True)
+               for i in range(max(int(concurrency), 1))]
+    for t in threads:
+        t.start()
+    try:
+        while True:
+            queue.purge(retention)
+            if stop.wait(3600):
+                break
+    finally:
+        stop.set()
+        for t in threads:
+            t.join()
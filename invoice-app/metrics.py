@@ -0,0 +1,162 @@
+"""In-process stage timers and counters, exported in Prometheus text format.
+
+Every process (gunicorn worker or render-pool worker) keeps its own
+histograms and counters and writes them to ``<directory>/<pid>.json`` after
+each unit of work.  ``/metrics`` adds up all the files, so the numbers cover
+every worker and survive restarts: a process that finds a file left behind
+by an earlier process with the same pid carries on from its values.
+
+Without a directory (benchmarks, the desktop app) everything stays in memory.
+"""
+from contextlib import contextmanager
+import glob
+import json
+import os
+import tempfile
+import threading
+import time
+
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+STAGE_HISTOGRAM = "invoice_stage_seconds"
+
+HELP = {
+    STAGE_HISTOGRAM: ("histogram", "Time spent in each stage of producing an invoice."),
+    "invoices_total": ("counter", "Invoices saved."),
+    "invoice_lines_total": ("counter", "Line items on saved invoices."),
+    "pdf_bytes_total": ("counter", "Bytes of PDF rendered."),
+    "bad_requests_total": ("counter", "Invoice requests rejected with 400 by validation."),
+    "db_errors_total": ("counter", "Invoice saves rolled back after a database error."),
+    "render_errors_total": ("counter", "Renders that failed or timed out."),
+}
+
+
+class Registry:
+    """Histograms of stage timings plus plain counters for one process."""
+
+    def __init__(self, directory: str = None):
+        self.directory = None
+        self._lock = threading.Lock()
+        self._reset()
+        if directory:
+            self.configure(directory)
+        if hasattr(os, "register_at_fork"):
+            # a forked child must not report the parent's numbers again
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def configure(self, directory: str) -> None:
+        """Persist to ``directory`` from now on."""
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self._load()
+
+    # ---------- recording ------------------------------------------
+    def observe(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            h = self._hist.get(stage)
+            if h is None:
+                h = self._hist[stage] = [0] * (len(BUCKETS) + 1) + [0.0]
+            for i, bound in enumerate(BUCKETS):
+                if seconds <= bound:
+                    h[i] += 1
+                    break
+            else:
+                h[len(BUCKETS)] += 1             # +Inf
+            h[-1] += seconds
+            self._dirty = True
+
+    @contextmanager
+    def stage(self, name: str):
+        """``with METRICS.stage("commit"): ...`` times the block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def inc(self, counter: str, n: float = 1) -> None:
+        with self._lock:
+            self._counters[counter] = self._counters.get(counter, 0) + n
+            self._dirty = True
+
+    # ---------- persistence ----------------------------------------
+    def flush(self) -> None:
+        """Write this process's numbers to its file, if anything changed."""
+        if self.directory is None or not self._dirty:
+            return
+        with self._lock:
+            data = {"hist": self._hist, "counters": self._counters}
+            blob = json.dumps(data)
+            self._dirty = False
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            f.write(blob)
+        os.replace(tmp, self._path())
+
+    def _path(self) -> str:
+        return os.path.join(self.directory, f"{os.getpid()}.json")
+
+    def _load(self) -> None:
+        try:
+            with open(self._path()) as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        with self._lock:
+            self._hist, self._counters = data["hist"], data["counters"]
+
+    def _reset(self) -> None:
+        self._hist = {}                          # stage -> bucket counts + [sum]
+        self._counters = {}
+        self._dirty = False
+
+    def _after_fork(self) -> None:
+        self._lock = threading.Lock()
+        self._reset()
+        if self.directory is not None:
+            self._load()
+
+    # ---------- export ---------------------------------------------
+    def collect(self):
+        """``(hist, counters)`` summed over every process that wrote a file."""
+        self.flush()
+        if self.directory is None:
+            with self._lock:
+                return {k: list(v) for k, v in self._hist.items()}, dict(self._counters)
+        hist, counters = {}, {}
+        for path in glob.glob(os.path.join(self.directory, "*.json")):
+            try:
+                with open(path) as f:
+                    data = json.load(f)
+            except (FileNotFoundError, ValueError):
+                continue
+            for stage, values in data["hist"].items():
+                acc = hist.setdefault(stage, [0] * len(values))
+                for i, v in enumerate(values):
+                    acc[i] += v
+            for name, v in data["counters"].items():
+                counters[name] = counters.get(name, 0) + v
+        return hist, counters
+
+    def render_text(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        hist, counters = self.collect()
+        out = []
+        kind, text = HELP[STAGE_HISTOGRAM]
+        out += [f"# HELP {STAGE_HISTOGRAM} {text}", f"# TYPE {STAGE_HISTOGRAM} {kind}"]
+        for stage in sorted(hist):
+            values, cumulative = hist[stage], 0
+            for bound, n in zip(BUCKETS + ("+Inf",), values):
+                cumulative += n
+                out.append(f'{STAGE_HISTOGRAM}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+            out.append(f'{STAGE_HISTOGRAM}_sum{{stage="{stage}"}} {values[-1]:.6f}')
+            out.append(f'{STAGE_HISTOGRAM}_count{{stage="{stage}"}} {cumulative}')
+        for name, (kind, text) in HELP.items():
+            if kind != "counter":
+                continue
+            out += [f"# HELP {name} {text}", f"# TYPE {name} counter",
+                    f"{name} {counters.get(name, 0)}"]
+        return "\n".join(out) + "\n"
+
+
+METRICS = Registry()
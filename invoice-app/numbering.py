@@ -0,0 +1,72 @@
+"""Database-backed invoice numbering that is safe across gunicorn workers.
+
+The next free number lives in one row of a sequence table.  Two modes:
+
+* ``block_size=0`` (gapless): the number is taken inside the invoice's own
+  transaction.  The sequence row stays locked until commit, and a rollback
+  gives the number back, so issued invoices are strictly consecutive.
+* ``block_size=N``: each worker reserves ``N`` numbers at a time in a short
+  transaction of its own and hands them out from memory.  Numbers left over
+  when a worker exits, or taken by a failed insert, become gaps.
+"""
+import os
+import threading
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+
+
+class NumberAllocator:
+    """Hands out invoice numbers from a ``(name, next_no)`` sequence table."""
+
+    def __init__(self, table, block_size: int = 0, name: str = "invoice", seed=None):
+        self.table = table
+        self.block_size = max(int(block_size), 0)
+        self.name = name
+        self._seed = seed or (lambda conn: 1)    # first number for a new sequence
+        self._lock = threading.Lock()
+        self._next = self._end = 0               # reserved block [next, end)
+        if hasattr(os, "register_at_fork"):
+            # a block reserved before gunicorn forks must not be shared
+            os.register_at_fork(after_in_child=self._forget)
+
+    def take(self, session, n: int = 1) -> int:
+        """Reserve ``n`` consecutive numbers and return the first one."""
+        if not self.block_size:
+            return self._reserve(session.connection(), n)
+        with self._lock:
+            if self._end - self._next < n:
+                with session.get_bind().begin() as conn:
+                    k = max(self.block_size, n)
+                    self._next = self._reserve(conn, k)
+                    self._end = self._next + k
+            first = self._next
+            self._next += n
+            return first
+
+    def peek(self, session) -> int:
+        """Best guess at the next number, read without taking any lock."""
+        if self._end > self._next:
+            return self._next
+        t = self.table
+        with session.get_bind().connect() as conn:
+            nxt = conn.execute(select(t.c.next_no).where(t.c.name == self.name)).scalar()
+            return nxt if nxt is not None else self._seed(conn)
+
+    def _forget(self) -> None:
+        self._lock = threading.Lock()
+        self._next = self._end = 0
+
+    def _reserve(self, conn, k: int) -> int:
+        t = self.table
+        bump = update(t).where(t.c.name == self.name).values(next_no=t.c.next_no + k)
+        # the UPDATE takes the row lock before we read the new value back
+        if conn.execute(bump).rowcount == 0:
+            try:
+                with conn.begin_nested():
+                    conn.execute(insert(t).values(name=self.name, next_no=self._seed(conn)))
+            except IntegrityError:
+                pass                             # another worker created it first
+            conn.execute(bump)
+        end = conn.execute(select(t.c.next_no).where(t.c.name == self.name)).scalar_one()
+        return end - k
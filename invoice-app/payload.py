@@ -0,0 +1,269 @@
+"""Request bodies for ``/generate``: decoding and validation.
+
+The invoice schema is compiled once, at import, into one small closure per
+field, so checking a payload is a straight run of ``isinstance`` tests with
+no schema walking.  Valid payloads come out as typed ``InvoiceIn`` objects
+with quantities and rates already in thousandths and paise.  Invalid ones
+raise ``PayloadError``, which lists every problem with its JSON path, so the
+endpoint answers 400 before any database or render work starts.
+"""
+import json
+import os
+import re
+import sys
+from typing import NamedTuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from invoice_core.money import scaled
+
+MAX_ERRORS = 20                          # problems reported per request
+
+# column sizes in app.py; longer values would fail on the INSERT
+MAX_QTY = "9999999.999"
+MAX_RATE = "99999999.99"
+MAX_AMOUNT = 10 ** 10                    # paise, Numeric(10, 2)
+
+# numbers may come as strings from form fields: sign, whole and fraction
+# digits.  No exponents, so "1e999999" cannot turn into an enormous int.
+_DECIMAL = re.compile(r"\s*([+-]?)(?=\.?\d)(\d*)(?:\.(\d*))?\s*")
+
+
+class ItemIn(NamedTuple):
+    desc: str
+    hsn: str
+    qty: int                             # thousandths of a unit
+    rate: int                            # paise
+
+
+class InvoiceIn(NamedTuple):
+    customer: dict                       # name, phone, address, district, state, vehicle, jobcard
+    items: tuple                         # ItemIn
+    with_gst: bool
+
+
+class PayloadError(ValueError):
+    """A request body that is not a valid invoice."""
+
+    def __init__(self, errors: list):
+        super().__init__("; ".join(f"{e['path']}: {e['message']}" for e in errors))
+        self.errors = errors
+
+    def body(self) -> dict:
+        return {"error": "Invalid invoice payload", "details": self.errors}
+
+
+_BAD = object()                          # a field that failed; its error is recorded
+
+
+def _path_text(path) -> str:
+    parts = []
+    while path:
+        path, key = path
+        parts.append(f"[{key}]" if isinstance(key, int) else f".{key}")
+    return "".join(reversed(parts)).lstrip(".") or "$"
+
+
+def _fail(errors: list, path, message: str):
+    if len(errors) < MAX_ERRORS:
+        errors.append({"path": _path_text(path), "message": message})
+    return _BAD
+
+
+# ---------- schema building blocks ---------------------------------
+# Each returns check(value, path, errors) -> converted value or _BAD;
+# ``value`` is None when the key is missing.  ``path`` is a linked list of
+# ``(parent, key)`` pairs, only spelled out when there is an error to report.
+
+def _string(max_len: int, required: bool = False):
+    def check(value, path, errors):
+        if value is None:
+            value = ""
+        elif isinstance(value, bool) or not isinstance(value, (str, int)):
+            return _fail(errors, path, "must be a string")
+        text = str(value).strip()
+        if not text:
+            return _fail(errors, path, "is required") if required else text
+        if len(text) > max_len:
+            return _fail(errors, path, f"must be at most {max_len} characters")
+        return text
+    return check
+
+
+def _positive(places: int, maximum: str, default: str = None):
+    """A number or numeric string > 0, as an int scaled by ``10**places``."""
+    scale = 10 ** places
+    limit = scaled(maximum, places)
+    fallback = None if default is None else scaled(default, places)
+
+    def check(value, path, errors):
+        if value is None or value == "":
+            if fallback is None:
+                return _fail(errors, path, "is required")
+            return fallback
+        if isinstance(value, str):
+            m = _DECIMAL.fullmatch(value)
+            if m is None:
+                return _fail(errors, path, "must be a number")
+            # what ``scaled`` does, from the digits already matched
+            sign, whole, frac = m.groups(default="")
+            n = int(whole or "0") * scale + int(frac[:places].ljust(places, "0"))
+            if frac[places:places + 1] >= "5":
+                n += 1
+            if sign == "-":
+                n = -n
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            try:
+                n = scaled(value, places)
+            except ValueError:               # NaN, Infinity
+                return _fail(errors, path, "must be a number")
+        else:
+            return _fail(errors, path, "must be a number")
+        if n <= 0:
+            return _fail(errors, path, "must be greater than 0")
+        if n > limit:
+            return _fail(errors, path, f"must be at most {maximum}")
+        return n
+    return check
+
+
+def _boolean(default: bool):
+    def check(value, path, errors):
+        if value is None:
+            return default
+        if not isinstance(value, bool):
+            return _fail(errors, path, "must be true or false")
+        return value
+    return check
+
+
+def _object(fields: dict, build, then=None):
+    """An object with ``fields``; unknown keys are ignored.  ``then`` can
+    check the built value as a whole."""
+    names = tuple(fields)
+    checks = tuple(fields.values())
+
+    def check(value, path, errors):
+        if value is None:
+            return _fail(errors, path, "is required")
+        if not isinstance(value, dict):
+            return _fail(errors, path, "must be an object")
+        get = value.get
+        out = [field(get(name), (path, name), errors) for name, field in zip(names, checks)]
+        if _BAD in out:
+            return _BAD
+        built = build(*out)
+        return then(built, path, errors) if then else built
+    return check
+
+
+def _array(item, min_items: int = 0):
+    def check(value, path, errors):
+        if value is None:
+            return _fail(errors, path, "is required")
+        if not isinstance(value, list):
+            return _fail(errors, path, "must be a list")
+        if len(value) < min_items:
+            return _fail(errors, path, f"must have at least {min_items} entr{'y' if min_items == 1 else 'ies'}")
+        out, ok = [], True
+        for i, v in enumerate(value):
+            v = item(v, (path, i), errors)
+            if v is _BAD:
+                ok = False
+                if len(errors) >= MAX_ERRORS:
+                    break
+            else:
+                out.append(v)
+        return tuple(out) if ok else _BAD
+    return check
+
+
+# ---------- the invoice schema -------------------------------------
+def _line_fits(item: ItemIn, path, errors):
+    if item.qty * item.rate // 1000 >= MAX_AMOUNT:
+        return _fail(errors, path, "qty x rate is too large")
+    return item
+
+
+def _location_fits(customer: dict, path, errors):
+    # stored as one "district, state" column of 100 characters
+    if len(customer["district"]) + len(customer["state"]) + 2 > 100:
+        return _fail(errors, (path, "district"), "district and state together are too long")
+    return customer
+
+
+_ITEM = _object({
+    "desc": _string(200, required=True),
+    "hsn": _string(20),
+    "qty": _positive(3, MAX_QTY, default="1"),
+    "rate": _positive(2, MAX_RATE),
+}, ItemIn, then=_line_fits)
+
+_CUSTOMER_FIELDS = ("name", "phone", "address", "district", "state", "vehicle", "jobcard")
+_CUSTOMER = _object({
+    "name": _string(100, required=True),
+    "phone": _string(20),
+    "address": _string(1000),
+    "district": _string(100),
+    "state": _string(100),
+    "vehicle": _string(20),
+    "jobcard": _string(50),
+}, lambda *values: dict(zip(_CUSTOMER_FIELDS, values)), then=_location_fits)
+
+_INVOICE = _object({
+    "customer": _CUSTOMER,
+    "items": _array(_ITEM, min_items=1),
+    "with_gst": _boolean(True),
+}, InvoiceIn)
+
+_INVOICES = _array(_INVOICE, min_items=1)
+
+
+def _run(check, data, path=None):
+    errors = []
+    value = check(data, path, errors)
+    if value is _BAD:
+        raise PayloadError(errors)
+    return value
+
+
+# ---------- entry points -------------------------------------------
+def loads(raw):
+    """``json.loads`` that fails with a ``PayloadError``."""
+    try:
+        return json.loads(raw)
+    except ValueError as e:                  # JSONDecodeError, UnicodeDecodeError
+        raise PayloadError([{"path": "$", "message": f"not valid JSON: {e}"}]) from None
+
+
+def parse_invoice(data) -> InvoiceIn:
+    """One invoice object, validated."""
+    return _run(_INVOICE, data)
+
+
+def parse_invoices(data) -> tuple:
+    """A list of invoice objects, or ``{"invoices": [...]}``, validated."""
+    if isinstance(data, dict) and "invoices" in data:
+        return _run(_INVOICES, data["invoices"], (None, "invoices"))
+    return _run(_INVOICES, data)
+
+
+def read_ndjson(lines) -> tuple:
+    """Invoices from newline-delimited JSON, one object per line.
+
+    Lines are checked as they are read, and reading stops at the first bad
+    one, so a large upload with a typo on line 3 is turned away at line 3.
+    Errors carry the 1-based ``line`` they were found on.
+    """
+    out = []
+    for lineno, raw in enumerate(lines, 1):
+        if not raw.strip():
+            continue
+        try:
+            out.append(parse_invoice(loads(raw)))
+        except PayloadError as e:
+            for err in e.errors:
+                err["line"] = lineno
+            raise
+    if not out:
+        raise PayloadError([{"path": "$", "message": "no invoices in the request body"}])
+    return tuple(out)
@@ -0,0 +1,96 @@
+"""Content-addressed on-disk cache of rendered invoice PDFs.
+
+A PDF is stored under the SHA-256 of the invoice's canonical data (see
+``_describe`` in app.py), so the key doubles as a strong ETag and any change
+to the invoice, or to the layout revision, simply lands on a new file.  Files
+live two levels deep (``ab/abcdef....pdf``) and are written atomically.
+
+The cache is kept under ``max_bytes``: when a write pushes it over, the least
+recently used files are deleted until it is back below 90 % of the limit.
+``get`` records use in the file's atime and leaves the mtime alone, so the
+mtime stays a stable Last-Modified.  Several processes may share one
+directory.
+"""
+from hashlib import sha256
+import json
+import os
+import tempfile
+import threading
+import time
+
+
+class PdfCache:
+    """Rendered PDFs in ``directory``, evicted LRU past ``max_bytes``."""
+
+    def __init__(self, directory: str, max_bytes: int = 200 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._size = None                       # bytes on disk, scanned lazily
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(data) -> str:
+        """Hex digest of ``data`` serialized as canonical JSON."""
+        blob = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+        return sha256(blob.encode()).hexdigest()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.pdf")
+
+    def get(self, key: str):
+        """Path of the cached PDF for ``key``, or ``None``."""
+        path = self.path(key)
+        try:
+            # mark as recently used without touching the mtime
+            os.utime(path, ns=(time.time_ns(), os.stat(path).st_mtime_ns))
+        except FileNotFoundError:
+            return None
+        return path
+
+    def put(self, key: str, pdf: bytes) -> str:
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(pdf)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for _m, size, _p in self._entries())
+            else:
+                self._size += len(pdf)
+            if self._size > self.max_bytes:
+                self._evict()
+        return path
+
+    def _entries(self):
+        for sub in os.scandir(self.directory):
+            if not sub.is_dir():
+                continue
+            for entry in os.scandir(sub.path):
+                if entry.name.endswith(".pdf"):
+                    try:
+                        st = entry.stat()
+                    except FileNotFoundError:   # evicted by another process
+                        continue
+                    yield st.st_atime, st.st_size, entry.path
+
+    def _evict(self) -> None:
+        # rescan: other processes write to the same directory
+        entries = sorted(self._entries())
+        total = sum(size for _m, size, _p in entries)
+        target = self.max_bytes * 0.9
+        for _atime, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        self._size = total
@@ -0,0 +1,607 @@
+"""PDF rendering for the web app.
+
+Everything here works on plain, picklable invoice descriptions so it can run
+in a worker process (see ``render_pool``) without touching Flask or the DB.
+"""
+from io import BytesIO
+from decimal import Decimal
+from functools import lru_cache
+from itertools import accumulate
+from typing import NamedTuple
+import os, sys, time
+
+from reportlab import rl_config
+from reportlab.pdfgen import canvas
+from reportlab.pdfbase import pdfmetrics
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.rl_accel import escapePDF
+
+from metrics import METRICS
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from invoice_core.forms import StaticForm
+from invoice_core.invoice import Invoice
+from invoice_core.money import money
+from invoice_core.pages import paginate
+from invoice_core.totals import PER_INVOICE, compute_lines, price_lines
+from invoice_core.words import amount_in_words
+from invoice_core.qr import QR_CACHE, VECTOR as QR_VECTOR, draw_qr
+
+# write compressed streams as binary; ASCII85 only makes every PDF ~25% larger
+rl_config.useA85 = 0
+
+# bump whenever the layout changes: cached PDFs are keyed on it
+LAYOUT_REVISION = 2
+
+COMPANY = {
+    "name":  "SATYA SAI BABA AUTO ELECTRICAL WORKS",
+    "tag":   "Authorised MICO BOSCH Service",
+    "addr1": "Venkateswara Theatre Rd, Near IMA Hall, Ganga Enclave",
+    "addr2": "Satyanarayana Puram, GUDIVADA – 521 301",
+    "state": "Andhra Pradesh · State Code : 37",
+    "phone": "9958592564 , 8074546541",
+    "gstin": "GSTIN : 37CYCP5977H1ZM",
+    "logo":  os.path.join("static", "logo.png")
+}
+
+CGST = SGST = Decimal("9")  # %
+
+# Format shop details for the QR code to be easily readable when scanned
+SHOP_QR = (
+    f"Shop Name: {COMPANY['name']}\n"
+    f"Address: {COMPANY['addr1']}, {COMPANY['addr2']}\n"
+    f"Phone: {COMPANY['phone']}\n"
+    f"GSTIN: {COMPANY['gstin'].replace('GSTIN : ', '')}"
+)
+
+def customer_location(cust: dict) -> str:
+    return f"{cust.get('district', '')}, {cust.get('state', '')}".strip(', ')
+
+# ---------- page geometry & static layers -------------------------
+PAGE_W, PAGE_H = letter
+MARGIN = 30                              # page margins for better structure
+CONTENT_WIDTH = PAGE_W - 2 * MARGIN
+HEADER_TOP = PAGE_H - MARGIN - 20
+HEADER_HEIGHT = 100
+FOOTER_LINE_Y = MARGIN + 80
+INFO_HEIGHT = 90                         # bill-to panels, first page only
+CONT_HEIGHT = 26                         # invoice strip on continuation pages
+
+# QR Code positioning in header (top right corner)
+QR_SIZE = 60
+QR_X = PAGE_W - MARGIN - QR_SIZE - 10
+QR_Y = HEADER_TOP - QR_SIZE - 10
+
+# Define colors - professional color scheme
+PRIMARY_COLOR = colors.HexColor('#2c3e50')  # Dark blue-gray
+PANEL_COLOR = colors.HexColor('#f8f9fa')
+
+def _draw_letterhead(c):
+    """Page border, header panel, company block, terms and signature."""
+    margin, w, h = MARGIN, PAGE_W, PAGE_H
+    current_y = HEADER_TOP
+
+    # ===== PAGE BORDER =====
+    c.setStrokeColor(PRIMARY_COLOR)
+    # Use a single, clean border with padding
+    c.setLineWidth(1.5)
+    border_padding = 10
+    c.rect(
+        margin - border_padding,
+        margin - border_padding,
+        w - 2 * (margin - border_padding),
+        h - 2 * (margin - border_padding)
+    )
+
+    # ===== HEADER SECTION =====
+    # Remove header border, just use background color
+    c.setFillColor(PANEL_COLOR)
+    c.rect(margin, current_y - HEADER_HEIGHT, CONTENT_WIDTH, HEADER_HEIGHT, fill=1, stroke=0)
+    c.setFillColor(colors.black)
+
+    # Vector shop QR is plain path data, so it lives in the form as well
+    if QR_VECTOR:
+        draw_qr(c, SHOP_QR, QR_X, QR_Y, QR_SIZE, box_size=3, border=1)
+
+    # QR label
+    c.setFont("Helvetica", 7)
+    c.drawCentredString(QR_X + QR_SIZE/2, QR_Y - 8, "Scan for Verification")
+
+    # Company name - centered but adjusted for QR code space
+    company_text_width = CONTENT_WIDTH - QR_SIZE - 20  # Leave space for QR
+    company_center_x = margin + (company_text_width / 2)
+
+    # Company name - centered and bold
+    c.setFont("Helvetica-Bold", 18)
+    c.drawCentredString(company_center_x, current_y - 25, COMPANY["name"])
+
+    c.setFont("Helvetica", 12)
+    c.drawCentredString(company_center_x, current_y - 40, COMPANY["tag"])
+
+    # Address lines
+    c.setFont("Helvetica", 10)
+    c.drawCentredString(company_center_x, current_y - 57, COMPANY["addr1"])
+    c.drawCentredString(company_center_x, current_y - 69, f"{COMPANY['addr2']}, {COMPANY['state']}")
+
+    # Contact info
+    c.setFont("Helvetica", 9)
+    contact_text = f"Cell: {COMPANY['phone']} | {COMPANY['gstin']}"
+    c.drawCentredString(company_center_x, current_y - 84, contact_text)
+
+    # --- Footer Line ---
+    c.setStrokeColor(PRIMARY_COLOR)
+    c.setLineWidth(1)
+    c.line(margin, FOOTER_LINE_Y, w - margin, FOOTER_LINE_Y)
+
+    # --- Terms & Conditions (Left side) ---
+    terms_y = FOOTER_LINE_Y - 15
+    c.setFont("Helvetica-Bold", 9)
+    c.drawString(margin, terms_y, "Terms & Conditions:")
+    c.setFont("Helvetica", 8)
+    c.drawString(margin, terms_y - 12, "1. Goods once sold will not be taken back or exchanged.")
+    c.drawString(margin, terms_y - 24, "2. All disputes are subject to Gudivada jurisdiction only.")
+
+    # --- Signature (Right side) ---
+    sig_y = FOOTER_LINE_Y - 15
+    c.setFont("Helvetica-Bold", 10)
+    c.drawRightString(w - margin, sig_y, f"For {COMPANY['name']}")
+    c.setFont("Helvetica", 9)
+    c.drawRightString(w - margin, sig_y - 40, "Authorised Signatory")
+
+def _draw_watermark(c):
+    # drawn straight on the page: ReportLab forms cannot carry the alpha
+    # ExtGState the watermark needs
+    c.saveState()
+    c.setFillColor(colors.Color(0.9, 0.9, 0.9, alpha=0.3))
+    c.setFont("Helvetica-Bold", 60)
+    c.rotate(45)
+    c.drawString(200, -100, "@SSAEW")
+    c.restoreState()
+
+LETTERHEAD_FORM = StaticForm("ssaewLetterhead", _draw_letterhead)
+
+def invoice_lines(items: list, with_gst: bool, rounding: str = PER_INVOICE):
+    """Parse raw item dicts once into ``(lines, totals)``."""
+    # choose rates
+    cgst_rate = CGST if with_gst else Decimal("0")
+    sgst_rate = SGST if with_gst else Decimal("0")
+    return compute_lines(items, cgst_rate, sgst_rate, rounding)
+
+def item_lines(items, with_gst: bool, rounding: str = PER_INVOICE):
+    """``invoice_lines`` for validated ``payload.ItemIn`` rows."""
+    cgst_rate = CGST if with_gst else Decimal("0")
+    sgst_rate = SGST if with_gst else Decimal("0")
+    return price_lines(items, cgst_rate, sgst_rate, rounding)
+
+def _draw_bill_to(c, inv_no: str, cust: dict, inv_date, current_y: float) -> None:
+    """Customer and invoice info panels on the first page."""
+    margin, w = MARGIN, PAGE_W
+    content_width = CONTENT_WIDTH
+
+    # ===== CUSTOMER AND INVOICE INFO SECTION =====
+    info_height = INFO_HEIGHT  # Slightly taller for better spacing
+    
+    # Left side - Customer info (60% width)
+    customer_width = content_width * 0.6
+    # Remove customer box border
+    c.setFillColor(PANEL_COLOR)
+    c.rect(margin, current_y - info_height, customer_width, info_height, fill=1, stroke=0)
+    c.setFillColor(colors.black)
+    
+    # Customer details (left side)
+    customer_y = current_y - 20
+    # Make "Bill To:" heading larger and bolder
+    c.setFont("Helvetica-Bold", 14)
+    heading_x = margin + (customer_width / 2)
+    c.drawCentredString(heading_x, customer_y, "Bill To")
+
+    # Details to display, excluding the ones to be placed side-by-side
+    details_x = margin + 10
+    details_y = customer_y - 15 # Add space below heading
+
+    # Combine District and State
+    location = customer_location(cust)
+
+    customer_details = [
+        ("Name", cust.get('name', '')),
+        ("Address", cust.get('address', '')),
+        ("Phone", cust.get('phone', ''))
+    ]
+
+    # Calculate alignment based on all labels to ensure consistency
+    align_labels = [label for label, _ in customer_details] + ["Location", "Vehicle No"]
+    max_label_width = max(c.stringWidth(f"{label}:", "Helvetica-Bold", 10) for label in align_labels)
+    value_x = details_x + max_label_width + 5
+
+    # Draw the main details
+    for i, (label, value) in enumerate(customer_details):
+        y_pos = details_y - (15 * i)
+        c.setFont("Helvetica-Bold", 10)
+        c.drawString(details_x, y_pos, f"{label}:")
+        c.setFont("Helvetica", 10)
+        c.drawString(value_x, y_pos, value)
+
+    # Draw Location and Vehicle No on the same line
+    y_pos = details_y - (15 * len(customer_details))
+    
+    # --- Draw Location ---
+    c.setFont("Helvetica-Bold", 10)
+    c.drawString(details_x, y_pos, "Location:")
+    c.setFont("Helvetica", 10)
+    c.drawString(value_x, y_pos, location)
+
+    # --- Draw Vehicle No ---
+    # Position it after the location text
+    location_width = c.stringWidth(location, "Helvetica", 10)
+    vehicle_x_start = value_x + location_width + 20 # Add padding
+
+    c.setFont("Helvetica-Bold", 10)
+    c.drawString(vehicle_x_start, y_pos, "Vehicle No:")
+    c.setFont("Helvetica", 10)
+    vehicle_label_width = c.stringWidth("Vehicle No:", "Helvetica-Bold", 10)
+    c.drawString(vehicle_x_start + vehicle_label_width + 5, y_pos, cust.get('vehicle', ''))
+
+    # Right side - Invoice info (40% width)
+    invoice_width = content_width * 0.35
+    invoice_x = w - margin - invoice_width
+    # Remove invoice box border, just use subtle background
+    c.setFillColor(PANEL_COLOR)
+    c.rect(invoice_x, current_y - info_height, invoice_width, info_height, fill=1, stroke=0)
+    c.setFillColor(colors.black)
+    
+    # Invoice header
+    c.setFont("Helvetica-Bold", 14)
+    c.drawCentredString(invoice_x + (w - margin - invoice_x)/2, current_y - 20, "TAX INVOICE")
+    
+    # --- Invoice Details (Right-aligned) ---
+    details_x_label = invoice_x + 10
+    details_x_value = w - margin - 10 # Right edge of the box
+
+    c.setFont("Helvetica-Bold", 10)
+    c.drawString(details_x_label, current_y - 40, "Invoice No:")
+    c.drawString(details_x_label, current_y - 55, "Date:")
+    c.drawString(details_x_label, current_y - 70, "Job Card No:")
+
+    c.setFont("Helvetica", 10)
+    c.drawRightString(details_x_value, current_y - 40, inv_no)
+    c.drawRightString(details_x_value, current_y - 55, inv_date.strftime("%d-%m-%Y"))
+    c.drawRightString(details_x_value, current_y - 70, cust.get("jobcard") or "N/A")
+
+def _draw_continued(c, inv_no: str, inv_date, page_no: int, current_y: float) -> None:
+    """One-line invoice strip at the top of a continuation page."""
+    c.setFillColor(PANEL_COLOR)
+    c.rect(MARGIN, current_y - CONT_HEIGHT, CONTENT_WIDTH, CONT_HEIGHT, fill=1, stroke=0)
+    c.setFillColor(colors.black)
+    c.setFont("Helvetica-Bold", 11)
+    c.drawString(MARGIN + 10, current_y - 17, f"TAX INVOICE {inv_no} (continued)")
+    c.setFont("Helvetica", 10)
+    c.drawRightString(PAGE_W - MARGIN - 10, current_y - 17,
+                      f"Date: {inv_date.strftime('%d-%m-%Y')}    Page {page_no}")
+
+# ---------- tables, drawn straight on the canvas -------------------
+# Same look as platypus ``Table`` with 10 pt text, 6 pt side padding and a
+# grey 0.5 pt grid, but the columns are fixed, so nothing needs a
+# ``TableStyle`` or per-cell measuring: a table is one text run and two
+# paths.
+TABLE_FONT_SIZE = 10
+CELL_PAD = 6
+ROW_HEIGHT = 21                          # 12 pt leading + 3 top + 6 bottom padding
+ROW_BASELINE = 8                         # text baseline above the row bottom
+ZEBRA_COLOR = colors.HexColor('#f9f9f9')
+
+class TableLayout(NamedTuple):
+    headers: tuple
+    widths: tuple
+    edges: tuple                         # column boundaries from the left, len(widths) + 1
+    align: str                           # "L", "C" or "R" per column
+
+    @property
+    def width(self) -> float:
+        return self.edges[-1]
+
+def _layout(headers, widths, align) -> TableLayout:
+    return TableLayout(tuple(headers), tuple(widths), tuple(accumulate(widths, initial=0)), align)
+
+ITEMS_GST = _layout(
+    ["S.No", "PARTICULARS", "HSN", "Qty", "Rate", "Taxable Amt", "CGST 9%", "SGST 9%", "Amount"],
+    [30, 120, 55, 35, 60, 60, 55, 55, 65], "CLCRRRRRR")
+ITEMS_PLAIN = _layout(
+    ["S.No", "PARTICULARS", "HSN", "Qty", "Rate", "Amount"],
+    [30, 220, 70, 40, 70, 70], "CLCRRR")
+
+TOTALS = _layout(("", ""), (120, 100), "RR")
+TOTALS_ROW = 22                          # 5 pt padding above and below
+TOTALS_LAST_ROW = 28                     # Grand Total: 8 pt padding
+TOTALS_BASELINE, TOTALS_LAST_BASELINE = 7, 10
+
+@lru_cache(maxsize=8192)
+def _text_width(text: str, font: str) -> float:
+    return pdfmetrics.stringWidth(text, font, TABLE_FONT_SIZE)
+
+def _fit(text: str, font: str, room: float) -> str:
+    """``text`` cut down with an ellipsis until it is at most ``room`` wide."""
+    if _text_width(text, font) <= room:
+        return text
+    lo, hi = 0, len(text)
+    while lo < hi:                       # longest prefix that fits with the ellipsis
+        mid = (lo + hi + 1) // 2
+        if pdfmetrics.stringWidth(text[:mid].rstrip() + "…", font, TABLE_FONT_SIZE) <= room:
+            lo = mid
+        else:
+            hi = mid - 1
+    return text[:lo].rstrip() + "…"
+
+@lru_cache(maxsize=8192)
+def _pdf_literal(text: str):
+    """The ``Tj`` operator showing ``text`` in a standard font, or None if it
+    has characters outside their WinAnsi encoding."""
+    try:
+        return f"({escapePDF(text.encode('cp1252'))}) Tj"
+    except UnicodeEncodeError:
+        return None
+
+class TextRun:
+    """Text operators for many table cells, added to the page in one go.
+
+    Each cell gets an absolute text matrix, so there is no canvas state to
+    track per cell.  Cells the fast path cannot encode are drawn afterwards
+    with ``drawString``, which knows ReportLab's font fallbacks.
+    """
+
+    def __init__(self, c):
+        self.c = c
+        self.ops = ["BT"]
+        self.font = None
+        self.slow = []                   # (font, x, y, text)
+
+    def set_font(self, font: str) -> None:
+        self.font = font
+        self.ops.append(f"{self.c._doc.getInternalFontName(font)} {TABLE_FONT_SIZE} Tf")
+
+    def set_gray(self, level: float) -> None:
+        self.ops.append(f"{level} g")
+
+    def put(self, x: float, y: float, text: str) -> None:
+        literal = _pdf_literal(text)
+        if literal is None:
+            self.slow.append((self.font, x, y, text))
+        else:
+            self.ops.append(f"1 0 0 1 {x:.2f} {y:.2f} Tm {literal}")
+
+    def put_row(self, layout: TableLayout, cells, x: float, y: float, align: str) -> None:
+        """One row of ``cells`` with ``y`` as the baseline."""
+        font = self.font
+        for text, left, width, how in zip(cells, layout.edges, layout.widths, align):
+            if text == "":
+                continue
+            text = str(text)
+            if how == "L":
+                self.put(x + left + CELL_PAD, y, _fit(text, font, width - 2 * CELL_PAD))
+            elif how == "R":
+                self.put(x + left + width - CELL_PAD - _text_width(text, font), y, text)
+            else:
+                self.put(x + left + (width - _text_width(text, font)) / 2, y, text)
+
+    def draw(self) -> None:
+        self.ops.append("ET")
+        self.c._code.append(" ".join(self.ops))
+        if self.slow:
+            self.c.setFillColor(colors.black)
+        for font, x, y, text in self.slow:
+            self.c.setFont(font, TABLE_FONT_SIZE)
+            self.c.drawString(x, y, text)
+
+def _carry_row(label: str, carry, with_gst: bool) -> list:
+    if with_gst:
+        return ["", label, "", "", "", money(carry.taxable), money(carry.cgst),
+                money(carry.sgst), money(carry.amount)]
+    return ["", label, "", "", "", money(carry.amount)]
+
+def _draw_items_table(c, page, with_gst: bool, x: float, top: float) -> float:
+    """Draw one page of line items below ``top``, starting at ``x``; returns the height."""
+    layout = ITEMS_GST if with_gst else ITEMS_PLAIN
+    width = layout.width
+    rows = []                            # (cells, bold)
+    if page.brought is not None:
+        rows.append((_carry_row("Brought forward", page.brought, with_gst), True))
+    for ln in page.lines:
+        if with_gst:
+            rows.append(((ln.s_no, ln.desc, ln.hsn, ln.qty_text, money(ln.rate), money(ln.taxable),
+                          money(ln.cgst), money(ln.sgst), money(ln.amount)), False))
+        else:
+            rows.append(((ln.s_no, ln.desc, ln.hsn, ln.qty_text, money(ln.rate),
+                          money(ln.amount)), False))
+    if not page.last:
+        rows.append((_carry_row("Carried forward", page.carried, with_gst), True))
+    height = (len(rows) + 1) * ROW_HEIGHT
+    bottom = top - height
+
+    c.saveState()
+    # header band, then every second row shaded
+    c.setFillColor(PRIMARY_COLOR)
+    c.rect(x, top - ROW_HEIGHT, width, ROW_HEIGHT, fill=1, stroke=0)
+    if len(rows) > 1:
+        zebra = c.beginPath()
+        for i in range(2, len(rows) + 1, 2):
+            zebra.rect(x, top - (i + 1) * ROW_HEIGHT, width, ROW_HEIGHT)
+        c.setFillColor(ZEBRA_COLOR)
+        c.drawPath(zebra, stroke=0, fill=1)
+
+    text = TextRun(c)
+    text.set_font("Helvetica-Bold")
+    text.set_gray(1)                     # white on the header band
+    text.put_row(layout, layout.headers, x, top - ROW_HEIGHT + ROW_BASELINE,
+                 "C" * len(layout.widths))
+    text.set_gray(0)
+    for i, (cells, bold) in enumerate(rows, 2):
+        font = "Helvetica-Bold" if bold else "Helvetica"
+        if font != text.font:
+            text.set_font(font)
+        text.put_row(layout, cells, x, top - i * ROW_HEIGHT + ROW_BASELINE, layout.align)
+    text.draw()
+
+    grid = c.beginPath()
+    for i in range(len(rows) + 2):
+        y = top - i * ROW_HEIGHT
+        grid.moveTo(x, y)
+        grid.lineTo(x + width, y)
+    for edge in layout.edges:
+        grid.moveTo(x + edge, top)
+        grid.lineTo(x + edge, bottom)
+    c.setStrokeColor(colors.grey)
+    c.setLineWidth(0.5)
+    c.setLineCap(1)
+    c.setLineJoin(1)
+    c.drawPath(grid, stroke=1, fill=0)
+    c.restoreState()
+    return height
+
+def _totals_rows(totals, with_gst: bool) -> list:
+    rows = []
+    if with_gst:
+        rows.extend([
+            ("Subtotal", money(totals.taxable)),
+            ("CGST @ 9%", money(totals.cgst)),
+            ("SGST @ 9%", money(totals.sgst)),
+        ])
+    rows.append(("Grand Total", money(totals.total)))
+    return rows
+
+def _totals_height(rows) -> float:
+    return (len(rows) - 1) * TOTALS_ROW + TOTALS_LAST_ROW
+
+def _draw_totals(c, rows, x: float, y: float) -> None:
+    """Right-aligned totals with the Grand Total in bold under a rule; ``y`` is the bottom."""
+    layout = TOTALS
+    top = y + _totals_height(rows)
+    c.saveState()
+    text = TextRun(c)
+    text.set_font("Helvetica")
+    for i, cells in enumerate(rows[:-1], 1):
+        text.put_row(layout, cells, x, top - i * TOTALS_ROW + TOTALS_BASELINE, layout.align)
+    text.set_font("Helvetica-Bold")
+    text.put_row(layout, rows[-1], x, y + TOTALS_LAST_BASELINE, layout.align)
+    text.draw()
+    c.setStrokeColor(colors.black)
+    c.setLineWidth(1.5)
+    c.setLineCap(1)
+    c.line(x, y + TOTALS_LAST_ROW, x + layout.width, y + TOTALS_LAST_ROW)
+    c.restoreState()
+
+def build_pdf(inv_no: str, cust: dict, lines, totals, with_gst: bool, inv_date) -> bytes:
+    """Render one invoice from ``invoice_lines()`` output and return the PDF bytes.
+
+    ``lines`` may be any iterable; rows are laid out page by page, so memory
+    stays flat however many lines the invoice has.
+    """
+    buf = BytesIO()
+    c   = canvas.Canvas(buf, pagesize=letter)
+    w, h = letter
+    margin = MARGIN
+
+    with METRICS.stage("letterhead"):        # page furniture and shop QR
+        LETTERHEAD_FORM.define(c)
+
+    # ===== TOTALS & FOOTER SECTION =====
+    # Position footer elements from the bottom of the page
+    footer_y_start = margin + 120
+    totals_width = TOTALS.width
+    totals_x = w - margin - totals_width
+    totals_rows = _totals_rows(totals, with_gst)
+    totals_table_height = _totals_height(totals_rows)
+
+    # --- Rows per page ---
+    row_h = ROW_HEIGHT
+    body_top = HEADER_TOP - HEADER_HEIGHT - 10
+
+    def capacity(page_no: int, last: bool) -> int:
+        top = body_top - (INFO_HEIGHT + 20 if page_no == 1 else CONT_HEIGHT + 10)
+        bottom = footer_y_start + totals_table_height + 10 if last else FOOTER_LINE_Y + 10
+        rows = int((top - bottom) // row_h) - 1          # header row
+        return rows - (page_no > 1) - (not last)         # brought / carried forward rows
+
+    table_time = 0.0
+    for page in paginate(lines, capacity):
+        # Current Y position tracker
+        current_y = body_top
+        if page.number > 1:
+            c.showPage()
+
+        # ===== BORDER, HEADER & FOOTER (shared form) =====
+        LETTERHEAD_FORM.place(c)
+
+        # Raster shop QR is an image XObject and has to go on the page itself
+        if not QR_VECTOR:
+            draw_qr(c, SHOP_QR, QR_X, QR_Y, QR_SIZE, box_size=3, border=1)
+
+        if page.number == 1:
+            _draw_bill_to(c, inv_no, cust, inv_date, current_y)
+            # Add a small gap between sections
+            current_y -= INFO_HEIGHT + 20
+        else:
+            _draw_continued(c, inv_no, inv_date, page.number, current_y)
+            current_y -= CONT_HEIGHT + 10
+
+        # ===== ITEMS TABLE =====
+        started = time.perf_counter()
+        table_width = (ITEMS_GST if with_gst else ITEMS_PLAIN).width
+        # centred on the page
+        _draw_items_table(c, page, with_gst, (w - table_width) / 2, current_y)
+        table_time += time.perf_counter() - started
+
+        if page.last:
+            # Draw totals table
+            _draw_totals(c, totals_rows, totals_x, footer_y_start)
+
+            # --- Amount in Words (Left side) ---
+            # Dynamically position based on the totals table's height to prevent overlap
+            amount_in_words_y = footer_y_start + totals_table_height - 15
+            with METRICS.stage("words"):
+                amount_in_words_text = amount_in_words(totals.total)
+            c.setFont("Helvetica-Oblique", 9)
+            c.drawString(margin, amount_in_words_y, "Amount in Words:")
+            c.setFont("Helvetica-Bold", 10)
+            c.drawString(margin, amount_in_words_y - 15, amount_in_words_text)
+
+        if page.number > 1 or not page.last:
+            c.setFont("Helvetica", 8)
+            c.drawCentredString(w / 2, margin - 5, f"Page {page.number}")
+
+        # ===== WATERMARK =====
+        _draw_watermark(c)
+
+    METRICS.observe("table", table_time)
+    with METRICS.stage("save"):
+        c.save()
+    return buf.getvalue()
+
+def warm_up() -> None:
+    """Build per-process constant assets before the first invoice.
+
+    app.py calls this at import, so under ``gunicorn --preload`` it runs once
+    in the master and every worker inherits the results.  Render-pool
+    processes call it again as their initializer, which is a no-op when they
+    were forked from a warm parent.
+    """
+    QR_CACHE.warm(SHOP_QR, box_size=3, border=1)
+    for font in ("Helvetica", "Helvetica-Bold", "Helvetica-Oblique"):
+        pdfmetrics.getFont(font)             # parse the AFM metrics once
+    c = canvas.Canvas(BytesIO(), pagesize=letter)
+    LETTERHEAD_FORM.define(c)                # record the letterhead operators
+    for layout in (ITEMS_GST, ITEMS_PLAIN):  # header widths are the same every time
+        for text in layout.headers:
+            _text_width(text, "Helvetica-Bold")
+
+def render_invoice(desc: Invoice) -> bytes:
+    """Render an invoice (see ``_describe`` in app.py) to PDF bytes."""
+    if isinstance(desc, dict):               # queued as a dict by an older release
+        desc = Invoice(**desc)
+    try:
+        with METRICS.stage("build_pdf"):
+            pdf = build_pdf(desc.inv_no, desc.customer, desc.lines,
+                            desc.totals, desc.with_gst, desc.date)
+        METRICS.inc("pdf_bytes_total", len(pdf))
+        return pdf
+    finally:
+        METRICS.flush()
@@ -0,0 +1,137 @@
+"""Process pool that keeps CPU-bound PDF rendering off the web worker.
+
+ReportLab and qrcode are pure Python, so threads do not help under
+the GIL.  ``RenderEngine`` hands invoice descriptions to a pool of worker
+processes instead and applies back-pressure: every in-flight job holds one of
+``max_pending`` slots, and ``acquire()`` fails fast with ``PoolSaturated``
+when they are all taken so the endpoint can answer 503.
+"""
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from collections import deque
+import sys
+import threading
+
+from metrics import METRICS
+from render import render_invoice, warm_up
+
+
+def _init_worker(metrics_dir) -> None:
+    """Pool initializer.  A forked worker inherits the metrics directory, but
+    under ``spawn``/``forkserver`` (macOS, Windows, Linux from Python 3.14)
+    ``metrics`` is imported afresh and has to be told where to write."""
+    if metrics_dir is not None and METRICS.directory != metrics_dir:
+        METRICS.configure(metrics_dir)
+    warm_up()
+
+
+class RenderError(RuntimeError):
+    """A render job failed or did not finish in time."""
+
+
+class RenderTimeout(RenderError):
+    """A render job did not finish within ``timeout`` seconds."""
+
+
+class PoolSaturated(RenderError):
+    """Every render slot is taken; the caller should retry later."""
+
+
+class RenderEngine:
+    """Bounded front-end to a lazily started ``ProcessPoolExecutor``.
+
+    ``workers=0`` renders in the calling thread, which is handy for debugging
+    and for single-process deployments.  ``mp_context`` picks the start
+    method of the worker processes (default: the platform's).
+    """
+
+    def __init__(self, workers: int = 1, max_pending: int = 4, timeout: float = 30.0,
+                 mp_context=None):
+        self.workers = max(int(workers), 0)
+        self.mp_context = mp_context
+        self.max_pending = max(int(max_pending), 1)
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self._executor = None
+
+    # ---------- slots ----------------------------------------------
+    def acquire(self) -> None:
+        """Reserve a slot for one request, or raise ``PoolSaturated``."""
+        if not self._slots.acquire(blocking=False):
+            raise PoolSaturated("render queue is full")
+
+    def release(self) -> None:
+        self._slots.release()
+
+    # ---------- rendering ------------------------------------------
+    def render(self, desc) -> bytes:
+        """Render one ``Invoice``; the caller must hold a slot from ``acquire()``.
+
+        The slot is given back when the job finishes, even if we stop waiting
+        for it, so a stuck job keeps counting against the queue depth.
+        """
+        if not self.workers:
+            try:
+                return render_invoice(desc)
+            finally:
+                self.release()
+        try:
+            fut = self._pool().submit(render_invoice, desc)
+        except BaseException:
+            self.release()
+            raise
+        fut.add_done_callback(lambda _f: self.release())
+        return self._result(fut)
+
+    def render_many(self, descs):
+        """Yield the PDFs for ``descs`` in order, keeping at most ``workers``
+        jobs in the pool.  The whole batch uses the caller's single slot,
+        which is released once the generator is exhausted or closed.
+        """
+        try:
+            if not self.workers:
+                for desc in descs:
+                    yield render_invoice(desc)
+                return
+            window = deque()
+            for desc in descs:
+                window.append(self._pool().submit(render_invoice, desc))
+                if len(window) >= self.workers:
+                    yield self._result(window.popleft())
+            while window:
+                yield self._result(window.popleft())
+        finally:
+            self.release()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                if sys.version_info >= (3, 9):
+                    self._executor.shutdown(wait=False, cancel_futures=True)
+                else:                            # no cancel_futures before 3.9
+                    self._executor.shutdown(wait=False)
+                self._executor = None
+
+    # ---------- internals ------------------------------------------
+    def _pool(self) -> ProcessPoolExecutor:
+        # started on first use so each forked web worker gets its own pool
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                     mp_context=self.mp_context,
+                                                     initializer=_init_worker,
+                                                     initargs=(METRICS.directory,))
+            return self._executor
+
+    def _result(self, fut) -> bytes:
+        try:
+            return fut.result(timeout=self.timeout)
+        except FutureTimeout:
+            fut.cancel()
+            raise RenderTimeout(f"render timed out after {self.timeout}s")
+        except BrokenProcessPool:
+            self.shutdown()
+            raise RenderError("render worker crashed")
+        except Exception as e:
+            raise RenderError(f"render failed: {e!r}") from e
@@ -0,0 +1,162 @@
+"""Daily GST rollups for filing reports.
+
+Two small tables hold running sums, in paise, of everything invoiced:
+
+* ``gst_daily``: one row per day and customer - invoices, taxable value,
+  CGST, SGST and total as charged (the ``Invoice`` row's figures);
+* ``gst_hsn_daily``: one row per day and HSN code - lines, quantity and the
+  line amounts as printed on the invoices.
+
+``GstRollups.add`` folds an invoice in with one native upsert per table
+(``ON DUPLICATE KEY UPDATE`` on MySQL, ``ON CONFLICT`` on SQLite/PostgreSQL)
+inside the invoice's own transaction, so the sums can never disagree with
+what was committed.  A report for any date range then reads at most a few
+rows per day from a primary-key range scan, however many invoices there
+are.  ``rebuild`` recomputes both tables from scratch.
+
+HSN sums add up per-line rounded tax, as printed in the item table, so under
+per-invoice rounding they can differ by a few paise from the day totals.
+"""
+from collections import defaultdict
+from datetime import date
+
+from sqlalchemy import delete, func, insert, select, update
+
+from invoice_core.money import Money
+from invoice_core.totals import fmt_qty
+
+GROUPS = ("hsn", "customer", "day")
+
+_DAILY_SUMS = ("invoices", "taxable", "cgst", "sgst", "total")
+_HSN_SUMS = ("lines", "quantity", "taxable", "cgst", "sgst")
+
+
+class GstRollups:
+    """Maintains and reads the ``daily`` and ``hsn`` rollup tables;
+    ``customers`` is the customer table, for names in reports."""
+
+    def __init__(self, daily, hsn, customers):
+        self.daily = daily
+        self.hsn = hsn
+        self.customers = customers
+        self._statements = {}                    # (dialect, table) -> upsert, built once
+
+    # ---------- writing ----------------------------------------------
+    @staticmethod
+    def _collect(invoices):
+        """Sum ``(day, customer_id, lines, totals)`` into rollup rows."""
+        daily = defaultdict(lambda: [0] * len(_DAILY_SUMS))
+        hsn = defaultdict(lambda: [0] * len(_HSN_SUMS))
+        for day, customer_id, lines, totals in invoices:
+            row = daily[day, customer_id]
+            row[0] += 1
+            for i, v in enumerate(totals, 1):
+                row[i] += int(v)
+            for ln in lines:
+                row = hsn[day, ln.hsn or ""]
+                row[0] += 1
+                row[1] += ln.qty
+                row[2] += int(ln.taxable)
+                row[3] += int(ln.cgst)
+                row[4] += int(ln.sgst)
+        # sorted, so concurrent transactions lock rows in the same order
+        return ([dict(zip(("day", "customer_id") + _DAILY_SUMS, k + tuple(v)))
+                 for k, v in sorted(daily.items())],
+                [dict(zip(("day", "hsn") + _HSN_SUMS, k + tuple(v)))
+                 for k, v in sorted(hsn.items())])
+
+    def add(self, conn, day: date, customer_id: int, lines, totals) -> None:
+        """Fold one invoice into the rollups, in the caller's transaction."""
+        daily, hsn = self._collect([(day, customer_id, lines, totals)])
+        self._upsert(conn, self.daily, ("day", "customer_id"), _DAILY_SUMS, daily)
+        self._upsert(conn, self.hsn, ("day", "hsn"), _HSN_SUMS, hsn)
+
+    def _upsert(self, conn, t, keys, sums, rows) -> None:
+        if not rows:
+            return
+        key = (conn.dialect.name, t.name)
+        if key not in self._statements:
+            self._statements[key] = _upsert_statement(key[0], t, keys, sums)
+        stmt = self._statements[key]
+        if stmt is not None:
+            conn.execute(stmt, rows)
+            return
+        # any other backend: add to the row, or create it
+        for row in rows:
+            where = [t.c[k] == row[k] for k in keys]
+            bump = update(t).where(*where).values({c: t.c[c] + row[c] for c in sums})
+            if conn.execute(bump).rowcount == 0:
+                conn.execute(insert(t).values(row))
+
+    def rebuild(self, conn, invoices, chunk: int = 5000) -> tuple:
+        """Replace both tables with sums over ``invoices``, an iterable of
+        ``(day, customer_id, lines, totals)``; returns the row counts."""
+        daily, hsn = self._collect(invoices)
+        for t, rows in ((self.daily, daily), (self.hsn, hsn)):
+            conn.execute(delete(t))
+            for i in range(0, len(rows), chunk):
+                conn.execute(insert(t), rows[i:i + chunk])
+        return len(daily), len(hsn)
+
+    # ---------- reading ----------------------------------------------
+    def report(self, conn, start: date, end: date, group: str) -> list:
+        """Sums from ``start`` to ``end`` (inclusive) per HSN code, customer
+        or day, as dicts with amounts in ``Money``."""
+        if group == "hsn":
+            t = self.hsn
+            rows = conn.execute(
+                select(t.c.hsn, *(func.sum(t.c[c]) for c in _HSN_SUMS))
+                .where(t.c.day.between(start, end))
+                .group_by(t.c.hsn).order_by(t.c.hsn)).all()
+            out = []
+            for hsn, lines, qty, taxable, cgst, sgst in rows:
+                taxable, cgst, sgst = int(taxable), int(cgst), int(sgst)
+                out.append({"hsn": hsn, "lines": int(lines), "quantity": fmt_qty(int(qty)),
+                            "taxable": Money(taxable), "cgst": Money(cgst),
+                            "sgst": Money(sgst), "total": Money(taxable + cgst + sgst)})
+            return out
+
+        t = self.daily
+        sums = [func.sum(t.c[c]) for c in _DAILY_SUMS]
+        in_range = t.c.day.between(start, end)
+        if group == "day":
+            rows = conn.execute(select(t.c.day, *sums).where(in_range)
+                                .group_by(t.c.day).order_by(t.c.day)).all()
+            heads = [{"date": r[0].isoformat()} for r in rows]
+        elif group == "customer":
+            per = (select(t.c.customer_id, *(s.label(c) for s, c in zip(sums, _DAILY_SUMS)))
+                   .where(in_range).group_by(t.c.customer_id).subquery())
+            c = self.customers
+            rows = conn.execute(
+                select(per.c.customer_id, c.c.name, c.c.phone, *(per.c[c] for c in _DAILY_SUMS))
+                .join(c, c.c.id == per.c.customer_id)
+                .order_by(per.c.total.desc(), per.c.customer_id)).all()
+            heads = [{"customer_id": r[0], "name": r[1], "phone": r[2] or ""} for r in rows]
+        else:
+            raise ValueError(f"unknown report group {group!r}")
+        out = []
+        for head, r in zip(heads, rows):
+            invoices, taxable, cgst, sgst, total = r[-5:]
+            head.update(invoices=int(invoices), taxable=Money(int(taxable)),
+                        cgst=Money(int(cgst)), sgst=Money(int(sgst)), total=Money(int(total)))
+            out.append(head)
+        return out
+
+
+def _upsert_statement(dialect: str, t, keys, sums):
+    """A native "insert, or add to the sums" statement, or ``None`` when the
+    dialect has no upsert."""
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+        stmt = mysql_insert(t)
+        return stmt.on_duplicate_key_update(**{c: t.c[c] + stmt.inserted[c] for c in sums})
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        stmt = dialect_insert(t)
+        return stmt.on_conflict_do_update(
+            index_elements=[t.c[k] for k in keys],
+            set_={c: t.c[c] + stmt.excluded[c] for c in sums})
+    return None
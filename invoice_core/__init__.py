@@ -0,0 +1 @@
+"""Rendering helpers shared by the desktop app and the Flask web app."""
@@ -0,0 +1,62 @@
+"""Fixed page furniture compiled once per process and placed as a Form XObject.
+
+A ``StaticForm`` wraps a drawing callback for the parts of an invoice that
+never change (border, company header, terms and signature).  The first document
+in a process runs the callback and keeps the PDF operators it produced; later
+documents get the same operators copied straight into a form, so the per
+invoice cost is one list extend instead of dozens of canvas calls.  Every page
+of a document then references the form with a single ``Do`` operator.
+"""
+import threading
+
+
+class StaticForm:
+    """A named, reusable layer of page furniture."""
+
+    def __init__(self, name: str, draw):
+        self.name = name
+        self._draw = draw
+        self._ops = None          # recorded operators, once compiled
+        self._fonts = None        # {font name: internal name} the ops refer to
+        self._lock = threading.Lock()
+
+    def define(self, c) -> None:
+        """Add the form to ``c``'s document unless it is already there.
+
+        Define all forms of a layout before drawing anything else so font
+        resources get the same names in every document and the recorded
+        operators can be reused.
+        """
+        if c.hasForm(self.name):
+            return
+        c.beginForm(self.name)
+        if self._ops is not None and self._fonts_match(c):
+            c._code.extend(self._ops)
+        else:
+            self._draw(c)
+            self._record(c)
+        c.endForm()
+
+    def place(self, c) -> None:
+        """Draw the layer on the current page of canvas ``c``."""
+        self.define(c)
+        c.doForm(self.name)
+
+    def _fonts_match(self, c) -> bool:
+        # font resource names are allocated per document; the recorded
+        # operators are only valid if this document maps fonts the same way
+        doc = c._doc
+        return all(doc.getInternalFontName(f) == ref for f, ref in self._fonts.items())
+
+    def _record(self, c) -> None:
+        if self._ops is not None:
+            return
+        ops = list(c._code)
+        text = "\n".join(ops)
+        if " gs" in text or " Do" in text:
+            # graphics-state and XObject resources are tracked per canvas, not
+            # per document, so layers using them (images) are redrawn
+            return
+        fonts = {f: ref for f, ref in c._doc.fontMapping.items() if ref + " " in text}
+        with self._lock:
+            self._ops, self._fonts = ops, fonts
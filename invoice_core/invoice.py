@@ -0,0 +1,48 @@
+"""The invoice both apps hand to their renderers.
+
+An ``Invoice`` is an immutable tuple of plain data - number, customer,
+priced ``Line``s, totals - with nothing from Tk or Flask in it, so it can be
+pickled to a render process or a job queue and rendered anywhere.  Like
+``Line`` it is a ``NamedTuple``: no per-instance ``__dict__``.
+
+``columns`` turns the lines around into one tuple per field, so sums and
+other whole-invoice figures are computed a column at a time.
+"""
+import datetime
+from typing import NamedTuple
+
+from invoice_core.totals import PER_INVOICE, LineColumns, RunningTotals, Totals, columns
+
+
+class Invoice(NamedTuple):
+    inv_no: str                          # as printed, e.g. "0042"
+    customer: dict                       # name, phone, address, district, state, vehicle, jobcard, po
+    lines: tuple                         # Line
+    totals: Totals
+    with_gst: bool = True
+    date: datetime.date = None
+
+    @property
+    def columns(self) -> LineColumns:
+        return columns(self.lines)
+
+    def column(self, name: str) -> tuple:
+        """One field of every line, e.g. ``invoice.column("amount")``."""
+        return getattr(self.columns, name)
+
+
+def build_invoice(inv_no: str, customer: dict, lines, with_gst: bool = True,
+                  date: datetime.date = None, rounding: str = PER_INVOICE,
+                  exact_total: bool = False) -> Invoice:
+    """An ``Invoice`` with its totals summed from ``lines``.
+
+    ``exact_total`` prints the grand total rounded once from the exact line
+    amounts, as the desktop app does, instead of the sum of the rounded
+    taxable value and taxes.
+    """
+    lines = tuple(lines)
+    sums = RunningTotals().add(lines)
+    totals = sums.totals(rounding)
+    if exact_total:
+        totals = totals._replace(total=sums.exact_total())
+    return Invoice(inv_no, customer, lines, totals, with_gst, date or datetime.date.today())
@@ -0,0 +1,156 @@
+"""Durable local record of every invoice the desktop app issues.
+
+The ledger is one SQLite database in WAL mode next to the PDFs.  An invoice
+and its lines are written in a single transaction *before* the PDF is drawn,
+so a number, once issued, is never handed out again - not after a crash, not
+after a restart.  ``number`` is the table's rowid, which makes the next free
+number one seek to the end of the B-tree however long the history is.
+
+Customer names and normalized vehicle numbers are indexed for looking up
+past job cards.  Amounts are stored in paise and quantities in thousandths,
+as in ``invoice_core.money``.
+"""
+from contextlib import closing
+import os
+import re
+import sqlite3
+import time
+from datetime import date
+
+from invoice_core.totals import RunningTotals
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ledger_invoice (
+    number      INTEGER PRIMARY KEY,
+    issued      TEXT NOT NULL,
+    customer    TEXT NOT NULL COLLATE NOCASE,
+    address     TEXT,
+    vehicle     TEXT,
+    vehicle_key TEXT,
+    job_card    TEXT,
+    po          TEXT,
+    taxable     INTEGER NOT NULL,
+    cgst        INTEGER NOT NULL,
+    sgst        INTEGER NOT NULL,
+    total       INTEGER NOT NULL,
+    created     REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS ledger_item (
+    number      INTEGER NOT NULL REFERENCES ledger_invoice (number) ON DELETE CASCADE,
+    s_no        INTEGER NOT NULL,
+    description TEXT NOT NULL,
+    hsn         TEXT,
+    qty         INTEGER NOT NULL,
+    rate        INTEGER NOT NULL,
+    taxable     INTEGER NOT NULL,
+    cgst        INTEGER NOT NULL,
+    sgst        INTEGER NOT NULL,
+    amount      INTEGER NOT NULL,
+    PRIMARY KEY (number, s_no)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_ledger_invoice_customer ON ledger_invoice (customer, number);
+CREATE INDEX IF NOT EXISTS ix_ledger_invoice_vehicle ON ledger_invoice (vehicle_key, number);
+"""
+
+_NOT_ALNUM = re.compile(r"[^0-9A-Z]")
+
+
+def vehicle_key(vehicle: str) -> str:
+    """``"ap16 tx-1234"`` -> ``"AP16TX1234"``, so spacing never splits a history."""
+    return _NOT_ALNUM.sub("", (vehicle or "").upper())
+
+
+class Ledger:
+    """Issued invoices stored in the SQLite database at ``path``."""
+
+    def __init__(self, path: str, seed=None):
+        self.path = path
+        self._seed = seed or (lambda: 1)         # first number of an empty ledger
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    def _next(self, conn) -> int:
+        last = conn.execute("SELECT MAX(number) FROM ledger_invoice").fetchone()[0]
+        return last + 1 if last is not None else self._seed()
+
+    def next_number(self) -> int:
+        """The number the next ``record`` will use."""
+        with closing(self._connect()) as conn:
+            return self._next(conn)
+
+    def record(self, customer: dict, lines, issued: date = None, number: int = None) -> int:
+        """Store an invoice and its ``Line``s; returns its number.
+
+        Without ``number`` the next free one is taken.  ``customer`` has
+        ``name``, ``address``, ``vehicle``, ``jobcard`` and ``po``.
+        """
+        lines = tuple(lines)
+        sums = RunningTotals().add(lines)
+        taxable, cgst, sgst, _ = sums.totals()
+        issued = issued or date.today()
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if number is None:
+                    number = self._next(conn)
+                conn.execute(
+                    "INSERT INTO ledger_invoice (number, issued, customer, address, vehicle,"
+                    " vehicle_key, job_card, po, taxable, cgst, sgst, total, created)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (number, issued.isoformat(), customer.get("name", ""),
+                     customer.get("address", ""), customer.get("vehicle", ""),
+                     vehicle_key(customer.get("vehicle", "")), customer.get("jobcard", ""),
+                     customer.get("po", ""), taxable, cgst, sgst, sums.exact_total(),
+                     time.time()))
+                conn.executemany(
+                    "INSERT INTO ledger_item (number, s_no, description, hsn, qty, rate,"
+                    " taxable, cgst, sgst, amount) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(number, ln.s_no, ln.desc, ln.hsn, ln.qty, ln.rate, ln.taxable,
+                      ln.cgst, ln.sgst, ln.amount) for ln in lines])
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return number
+
+    def discard(self, number: int) -> None:
+        """Forget an invoice whose PDF could not be written.
+
+        Discarding the latest invoice gives its number back.
+        """
+        with closing(self._connect()) as conn:
+            conn.execute("DELETE FROM ledger_invoice WHERE number = ?", (number,))
+
+    def find(self, customer: str = "", vehicle: str = "", limit: int = 20) -> list:
+        """Newest invoices for a vehicle, or else for a customer-name prefix."""
+        if vehicle_key(vehicle):
+            where, arg = "vehicle_key = ?", vehicle_key(vehicle)
+        elif customer.strip():
+            # a prefix LIKE on a NOCASE column can use the index
+            where, arg = "customer LIKE ? ESCAPE '\\'", (
+                customer.strip().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                + "%")
+        else:
+            return []
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT number, issued, customer, vehicle, job_card, po, total"
+                f" FROM ledger_invoice WHERE {where} ORDER BY number DESC LIMIT ?",
+                (arg, limit)).fetchall()
+        return [dict(r) for r in rows]
+
+    def items(self, number: int) -> list:
+        """Stored lines of invoice ``number`` as dicts, in order."""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT s_no, description, hsn, qty, rate, taxable, cgst, sgst, amount"
+                " FROM ledger_item WHERE number = ? ORDER BY s_no", (number,)).fetchall()
+        return [dict(r) for r in rows]
@@ -0,0 +1,111 @@
+"""Fixed-point money in integer paise.
+
+Line maths on ``Decimal`` objects created from strings, plus a ``quantize``
+for every printed cell, is a large share of the time spent on big invoices.
+Here amounts are plain integers:
+
+* money is held in paise (``Money``, an ``int`` subclass),
+* quantities in thousandths of a unit,
+* tax rates in thousandths of a percent (9 % -> ``9000``).
+
+A line's taxable value ``rate * qty`` is then exact in 1/1000 paise, and the
+tax on it exact in 1e-8 paise, so results match ``Decimal`` arithmetic
+bit for bit as long as rates have at most 2 decimals and quantities at
+most 3.  Rounding is always half away from zero, like ``ROUND_HALF_UP``.
+"""
+from decimal import Decimal, ROUND_HALF_UP
+
+QTY_SCALE = 1000            # quantity units per item
+RATE_SCALE = 1000           # tax-rate units per percent
+TAXABLE_SCALE = QTY_SCALE   # rate (paise) * qty -> 1/1000 paise
+TAX_SCALE = QTY_SCALE * 100 * RATE_SCALE   # taxable * rate -> 1e-8 paise
+
+
+class Money(int):
+    """An amount in paise that prints as rupees: ``str(Money(123450))`` is
+    ``"1234.50"``."""
+
+    __slots__ = ()
+
+    @classmethod
+    def parse(cls, value) -> "Money":
+        """Money from ``"1234.5"``, an ``int`` of rupees or a ``Decimal``."""
+        return cls(scaled(value, 2))
+
+    def decimal(self) -> Decimal:
+        return Decimal(int(self)).scaleb(-2)
+
+    def __str__(self) -> str:
+        return money(self)
+
+    def __repr__(self) -> str:
+        return f"Money('{money(self)}')"
+
+    def __add__(self, other):
+        r = int.__add__(self, other)
+        return r if r is NotImplemented else Money(r)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        r = int.__sub__(self, other)
+        return r if r is NotImplemented else Money(r)
+
+    def __neg__(self):
+        return Money(-int(self))
+
+
+ZERO = Money(0)
+
+
+def money(paise: int) -> str:
+    """Format paise as ``"1234.50"``."""
+    if paise < 0:
+        return "-" + money(-paise)
+    rupees, p = divmod(paise, 100)
+    return f"{rupees}.{p:02d}"
+
+
+def round_div(n: int, d: int) -> int:
+    """``n / d`` rounded half away from zero (``d`` > 0)."""
+    q, r = divmod(abs(n), d)
+    if 2 * r >= d:
+        q += 1
+    return -q if n < 0 else q
+
+
+def scaled(value, places: int) -> int:
+    """``value`` * 10**places as an int, rounded half-up.
+
+    Accepts ``str``, ``int`` and ``Decimal``; plain decimal strings are parsed
+    without building a ``Decimal``.  Raises ``ValueError`` on bad input.
+    """
+    if isinstance(value, int):
+        return value * 10 ** places
+    if not isinstance(value, Decimal):
+        text = str(value).strip()
+        digits = text.lstrip("+-")
+        whole, dot, frac = digits.partition(".")
+        if len(text) - len(digits) <= 1 and (whole or frac) \
+                and (not whole or whole.isdigit()) and (not frac or frac.isdigit()):
+            n = int(whole or "0") * 10 ** places + int(frac[:places].ljust(places, "0") or "0")
+            if len(frac) > places and frac[places] >= "5":
+                n += 1
+            return -n if text.startswith("-") else n
+        try:
+            value = Decimal(text)            # exponents and other odd forms
+        except ArithmeticError:
+            raise ValueError(f"not a number: {value!r}") from None
+    if not value.is_finite():
+        raise ValueError(f"not a number: {value!r}")
+    return int(value.scaleb(places).to_integral_value(ROUND_HALF_UP))
+
+
+def parse_qty(value) -> int:
+    """Quantity in thousandths of a unit."""
+    return scaled(value, 3)
+
+
+def parse_rate(percent) -> int:
+    """Tax rate in thousandths of a percent."""
+    return scaled(percent, 3)
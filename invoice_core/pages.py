@@ -0,0 +1,65 @@
+"""Split invoice lines into pages with carried-forward totals.
+
+``paginate`` pulls lines from any iterable and yields one ``Page`` at a time,
+holding at most one page of lines (plus one row of look-ahead) in memory, so
+a 5,000-line invoice renders just like a five-line one.  Continuation pages
+open with a "brought forward" row and every page but the last ends with a
+"carried forward" row; the running sums in those rows add up the amounts
+printed on each line.
+"""
+from itertools import islice
+from typing import Callable, NamedTuple, Optional
+
+from invoice_core.money import Money, ZERO
+
+
+class Carry(NamedTuple):
+    taxable: Money = ZERO
+    cgst: Money = ZERO
+    sgst: Money = ZERO
+    amount: Money = ZERO
+
+    def add(self, lines) -> "Carry":
+        taxable, cgst, sgst, amount = self
+        for ln in lines:
+            taxable += ln.taxable
+            cgst += ln.cgst
+            sgst += ln.sgst
+            amount += ln.amount
+        return Carry(taxable, cgst, sgst, amount)
+
+
+class Page(NamedTuple):
+    number: int                  # 1-based
+    lines: tuple
+    brought: Optional[Carry]     # None on the first page
+    carried: Carry               # running sums after this page's lines
+    last: bool
+
+
+def paginate(lines, capacity: Callable[[int, bool], int]):
+    """Yield ``Page``s for ``lines``.
+
+    ``capacity(number, last)`` is how many line rows fit on page ``number``;
+    ``last`` says whether it is the final page, which has no carried-forward
+    row but needs room for the invoice totals.  When the remaining lines fit
+    on a page but leave no room for the totals, the final line moves to a
+    page of its own so the totals never stand alone.
+    """
+    it = iter(lines)
+    pending = []
+    carry, brought, number = Carry(), None, 1
+    while True:
+        room = max(capacity(number, False), 1)
+        fits = capacity(number, True)
+        # one row more than either layout holds: if it does not turn up,
+        # ``lines`` is exhausted and this can be the last page
+        pending.extend(islice(it, max(max(room, fits) + 1 - len(pending), 0)))
+        if len(pending) <= fits:
+            yield Page(number, tuple(pending), brought, carry.add(pending), True)
+            return
+        take = room if len(pending) > room else max(len(pending) - 1, 1)
+        chunk, pending = tuple(pending[:take]), pending[take:]
+        carry = carry.add(chunk)
+        yield Page(number, chunk, brought, carry, False)
+        brought, number = carry, number + 1
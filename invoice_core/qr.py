@@ -0,0 +1,134 @@
+"""Memoized QR codes, drawn as vector modules or as a raster image.
+
+Encoding a QR (mask selection in ``qrcode``) plus the PNG round trip through
+Pillow is the most expensive step of a one-page invoice, yet the web app's
+shop QR never changes and the desktop app often reprints the same invoice.
+``QRCache`` keeps the finished result for each payload in a bounded LRU.
+
+``draw_qr`` paints the code straight onto the canvas as filled rectangles,
+one per horizontal run of dark modules.  That skips Pillow entirely and
+keeps an image stream out of the PDF.  Set ``INVOICE_QR_MODE=raster`` to go
+back to the PNG image.
+"""
+from collections import OrderedDict
+from io import BytesIO
+import os
+import threading
+
+from reportlab.lib.utils import ImageReader
+import qrcode
+
+
+class QRCache:
+    """Thread-safe LRU of rendered QR images."""
+
+    def __init__(self, maxsize: int = 64):
+        self.maxsize = maxsize
+        self.hits = self.misses = 0
+        self._images = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, payload: str, box_size: int = 10, border: int = 4) -> ImageReader:
+        """Raster QR as an ``ImageReader``."""
+        return self._lookup(("image", payload, box_size, border),
+                            lambda: _encode(payload, box_size, border))
+
+    def modules(self, payload: str, border: int = 4) -> tuple:
+        """``(width, runs)`` where each run is a ``(row, col, length)`` stretch
+        of dark modules and ``width`` counts modules including the border."""
+        return self._lookup(("vector", payload, border),
+                            lambda: _encode_runs(payload, border))
+
+    def warm(self, payload: str, box_size: int = 10, border: int = 4,
+             vector: bool = None) -> None:
+        """Encode ``payload`` ahead of the first request that needs it."""
+        if VECTOR if vector is None else vector:
+            self.modules(payload, border)
+        else:
+            self.get(payload, box_size, border)
+
+    def _lookup(self, key, build):
+        with self._lock:
+            value = self._images.get(key)
+            if value is not None:
+                self._images.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+        value = build()
+        with self._lock:
+            self._images[key] = value
+            self._images.move_to_end(key)
+            while len(self._images) > self.maxsize:
+                self._images.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._images.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._images)
+
+
+def _encode(payload: str, box_size: int, border: int) -> ImageReader:
+    img = qrcode.make(payload, box_size=box_size, border=border)
+    buf = BytesIO()
+    img.save(buf)
+    buf.seek(0)
+    return ImageReader(buf)
+
+
+def _encode_runs(payload: str, border: int) -> tuple:
+    qr = qrcode.QRCode(border=border)
+    qr.add_data(payload)
+    qr.make(fit=True)
+    matrix = qr.get_matrix()
+    runs = []
+    for row, cells in enumerate(matrix):
+        col, width = 0, len(cells)
+        while col < width:
+            if cells[col]:
+                start = col
+                while col < width and cells[col]:
+                    col += 1
+                runs.append((row, start, col - start))
+            else:
+                col += 1
+    return len(matrix), tuple(runs)
+
+
+VECTOR = os.environ.get("INVOICE_QR_MODE", "vector") != "raster"
+QR_CACHE = QRCache()
+
+
+def qr_image(payload: str, box_size: int = 10, border: int = 4) -> ImageReader:
+    """Cached ``ImageReader`` for ``payload`` from the process-wide cache."""
+    return QR_CACHE.get(payload, box_size, border)
+
+
+def draw_qr(c, payload: str, x: float, y: float, size: float,
+            box_size: int = 10, border: int = 4, vector: bool = None) -> None:
+    """Draw a ``size`` x ``size`` QR code with its lower-left corner at (x, y).
+
+    ``box_size`` only matters for the raster path; the vector path scales the
+    modules to ``size`` directly.
+    """
+    if not (VECTOR if vector is None else vector):
+        c.drawImage(qr_image(payload, box_size, border), x, y, size, size)
+        return
+    width, runs = QR_CACHE.modules(payload, border)
+    c.saveState()
+    # work in module units from the top-left corner: integer coordinates keep
+    # the content stream short
+    c.translate(x, y + size)
+    c.scale(size / width, size / width)
+    c.setFillColorRGB(1, 1, 1)                  # quiet zone, as in the image
+    c.rect(0, -width, width, width, stroke=0, fill=1)
+    c.setFillColorRGB(0, 0, 0)
+    path = c.beginPath()
+    for row, col, length in runs:
+        path.rect(col, -row - 1, length, 1)
+    c.drawPath(path, stroke=0, fill=1)
+    c.restoreState()
@@ -0,0 +1,164 @@
+"""Single-pass line-item totals shared by the DB write and the PDF.
+
+``compute_lines`` parses every item exactly once into an immutable ``Line``
+and sums the invoice on the way.  Whatever needs a figure (the ``Invoice``
+row, the item table, the totals block) reads it from the result, so stored
+and printed amounts cannot drift apart.
+
+All arithmetic is integer fixed point (see ``invoice_core.money``).  GST is
+rounded to paise by one of two rules:
+
+* ``PER_INVOICE`` (default): tax is summed exactly and each invoice total is
+  rounded once; the grand total is the sum of the rounded parts.
+* ``PER_LINE``: every line's CGST/SGST is rounded and the rounded figures
+  are added up.
+"""
+from typing import NamedTuple
+
+from invoice_core.money import (Money, QTY_SCALE, RATE_SCALE, TAX_SCALE,
+                                TAXABLE_SCALE, parse_qty, parse_rate, round_div, scaled)
+
+PER_INVOICE = "invoice"
+PER_LINE = "line"
+ROUNDING_RULES = (PER_INVOICE, PER_LINE)
+
+
+class Line(NamedTuple):
+    s_no: int
+    desc: str
+    hsn: str
+    qty: int             # thousandths of a unit
+    rate: Money
+    taxable: Money       # rounded per line, as printed
+    cgst: Money
+    sgst: Money
+    amount: Money
+    taxable_x: int       # exact, in 1/1000 paise
+    cgst_x: int          # exact, in 1e-8 paise
+    sgst_x: int
+
+    @property
+    def qty_text(self) -> str:
+        return fmt_qty(self.qty)
+
+
+# the lines of an invoice turned around: one tuple per ``Line`` field
+LineColumns = NamedTuple("LineColumns", [(name, tuple) for name in Line._fields])
+
+_NO_LINES = LineColumns(*((),) * len(Line._fields))
+
+
+def columns(lines) -> LineColumns:
+    """``lines`` as columns: ``columns(lines).amount`` is every line's amount."""
+    cols = tuple(zip(*lines))
+    return LineColumns._make(cols) if cols else _NO_LINES
+
+
+class Totals(NamedTuple):
+    taxable: Money
+    cgst: Money
+    sgst: Money
+    total: Money
+
+
+def fmt_qty(milli: int) -> str:
+    """``2000`` -> ``"2"``, ``1500`` -> ``"1.5"``."""
+    whole, frac = divmod(abs(milli), QTY_SCALE)
+    text = f"{whole}.{frac:03d}".rstrip("0").rstrip(".") if frac else str(whole)
+    return "-" + text if milli < 0 else text
+
+
+def make_line(s_no: int, desc: str, hsn: str, qty: int, rate: int,
+              cgst_rate: int, sgst_rate: int, rounding: str = PER_INVOICE) -> Line:
+    """Price one line; ``qty`` in thousandths, ``rate`` in paise, tax rates in
+    thousandths of a percent."""
+    taxable_x = rate * qty
+    cgst_x = taxable_x * cgst_rate
+    sgst_x = taxable_x * sgst_rate
+    taxable = Money(round_div(taxable_x, TAXABLE_SCALE))
+    cgst = Money(round_div(cgst_x, TAX_SCALE))
+    sgst = Money(round_div(sgst_x, TAX_SCALE))
+    if rounding == PER_LINE:
+        amount = Money(taxable + cgst + sgst)
+    else:
+        amount = Money(round_div(taxable_x * (100 * RATE_SCALE) + cgst_x + sgst_x, TAX_SCALE))
+    return Line(s_no, desc, hsn, qty, Money(rate), taxable, cgst, sgst, amount,
+                taxable_x, cgst_x, sgst_x)
+
+
+class RunningTotals(NamedTuple):
+    """Exact and per-line-rounded sums of the lines added so far.
+
+    ``add`` costs O(1) per line, so a form that adds lines one at a time can
+    show up-to-date totals without re-summing the whole invoice.
+    """
+    taxable_x: int = 0
+    cgst_x: int = 0
+    sgst_x: int = 0
+    taxable: int = 0
+    cgst: int = 0
+    sgst: int = 0
+
+    def add(self, lines) -> "RunningTotals":
+        cols = columns(lines)
+        # Money columns go through int() first: sum() over an int subclass
+        # would call Money.__add__ for every line
+        return RunningTotals(
+            self.taxable_x + sum(cols.taxable_x),
+            self.cgst_x + sum(cols.cgst_x),
+            self.sgst_x + sum(cols.sgst_x),
+            self.taxable + sum(map(int, cols.taxable)),
+            self.cgst + sum(map(int, cols.cgst)),
+            self.sgst + sum(map(int, cols.sgst)),
+        )
+
+    def totals(self, rounding: str = PER_INVOICE) -> Totals:
+        if rounding == PER_LINE:
+            taxable, cgst, sgst = self.taxable, self.cgst, self.sgst
+        else:
+            taxable = round_div(self.taxable_x, TAXABLE_SCALE)
+            cgst = round_div(self.cgst_x, TAX_SCALE)
+            sgst = round_div(self.sgst_x, TAX_SCALE)
+        return Totals(Money(taxable), Money(cgst), Money(sgst), Money(taxable + cgst + sgst))
+
+    def exact_total(self) -> Money:
+        """Grand total rounded once from the exact line amounts.
+
+        The desktop app has always printed this figure, which can differ by
+        a paisa from the sum of the rounded totals.
+        """
+        return Money(round_div(self.taxable_x * (100 * RATE_SCALE) + self.cgst_x + self.sgst_x,
+                               TAX_SCALE))
+
+
+def summarize(lines, rounding: str = PER_INVOICE) -> Totals:
+    """Invoice totals for ``lines`` under ``rounding``."""
+    return RunningTotals().add(lines).totals(rounding)
+
+
+def exact_total(lines) -> Money:
+    """``RunningTotals.exact_total`` for ``lines``."""
+    return RunningTotals().add(lines).exact_total()
+
+
+def price_lines(rows, cgst_rate, sgst_rate, rounding: str = PER_INVOICE):
+    """Return ``(lines, totals)`` for already parsed ``(desc, hsn, qty, rate)``
+    rows, ``qty`` in thousandths and ``rate`` in paise; tax rates are
+    percentages."""
+    if rounding not in ROUNDING_RULES:
+        raise ValueError(f"unknown GST rounding rule {rounding!r}")
+    cgst_r, sgst_r = parse_rate(cgst_rate), parse_rate(sgst_rate)
+    lines = tuple(
+        make_line(s_no, desc, hsn, qty, rate, cgst_r, sgst_r, rounding)
+        for s_no, (desc, hsn, qty, rate) in enumerate(rows, 1)
+    )
+    return lines, summarize(lines, rounding)
+
+
+def compute_lines(items, cgst_rate, sgst_rate, rounding: str = PER_INVOICE):
+    """Return ``(lines, totals)`` for raw item dicts (``desc``, ``hsn``,
+    ``qty``, ``rate``); rates are percentages."""
+    return price_lines(
+        ((item.get("desc", ""), item.get("hsn", ""), parse_qty(item.get("qty") or "0"),
+          scaled(item.get("rate") or "0", 2)) for item in items),
+        cgst_rate, sgst_rate, rounding)
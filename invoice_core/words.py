@@ -0,0 +1,68 @@
+"""Amounts in words with Indian digit grouping (lakh, crore).
+
+Produces exactly the wording of ``num2words(amount, lang="en_IN",
+to="currency", currency="INR")``, which the invoices used to call, without
+the dependency: ``12345.67`` -> "twelve thousand, three hundred and
+forty-five rupees, sixty-seven paise".  Three-digit chunks are memoized and
+whole amounts go through an LRU cache, since the same totals come back
+again and again.
+"""
+from functools import lru_cache
+
+_ONES = (
+    "zero", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine",
+    "ten", "eleven", "twelve", "thirteen", "fourteen", "fifteen", "sixteen",
+    "seventeen", "eighteen", "nineteen",
+)
+_TENS = ("", "", "twenty", "thirty", "forty", "fifty", "sixty", "seventy", "eighty", "ninety")
+
+# (value, name) of each group above the last three digits, largest first;
+# thousands and lakhs hold two digits each, crores whatever is left
+_GROUPS = ((10 ** 7, "crore"), (10 ** 5, "lakh"), (1000, "thousand"))
+
+
+@lru_cache(maxsize=1000)
+def _chunk(n: int) -> str:
+    """0 <= n < 1000 in words: "three hundred and forty-five"."""
+    if n < 20:
+        return _ONES[n]
+    if n < 100:
+        tens, ones = divmod(n, 10)
+        return _TENS[tens] + (f"-{_ONES[ones]}" if ones else "")
+    hundreds, rest = divmod(n, 100)
+    words = f"{_ONES[hundreds]} hundred"
+    return f"{words} and {_chunk(rest)}" if rest else words
+
+
+def cardinal(n: int) -> str:
+    """A whole number in words: 123456 -> "one lakh, twenty-three thousand,
+    four hundred and fifty-six"."""
+    if n < 0:
+        return "minus " + cardinal(-n)
+    if n < 1000:
+        return _chunk(n)
+    parts = []
+    for value, name in _GROUPS:
+        count, n = divmod(n, value)
+        if count:
+            # more than 999 crore reads "one thousand, two hundred crore"
+            parts.append(f"{cardinal(count) if count >= 1000 else _chunk(count)} {name}")
+    if not n:
+        return ", ".join(parts)
+    # "one thousand and five", but "one thousand, one hundred"
+    return ", ".join(parts) + (" and " if n < 100 else ", ") + _chunk(n)
+
+
+@lru_cache(maxsize=4096)
+def rupees_in_words(paise: int) -> str:
+    """``paise`` as "<n> rupees, <n> paise", singular for one."""
+    sign = "minus " if paise < 0 else ""
+    rupees, paise = divmod(abs(paise), 100)
+    return (f"{sign}{cardinal(rupees)} {'rupee' if rupees == 1 else 'rupees'}, "
+            f"{cardinal(paise)} {'paisa' if paise == 1 else 'paise'}")
+
+
+@lru_cache(maxsize=4096)
+def amount_in_words(paise: int) -> str:
+    """The "Amount in Words" line of an invoice: "One Rupee, Fifty Paise Only"."""
+    return (rupees_in_words(paise) + " Only").title()
@@ -1,40 +1,76 @@
 # invoice_generator.py
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import csv
+import io
+from itertools import islice
+import json
 import os
-import tkinter as tk
-from tkinter import ttk, messagebox
-from datetime import datetime
-from decimal import Decimal, ROUND_HALF_UP
-from io import BytesIO
+import queue
+import re
+import sqlite3
+import sys
+import threading
+import time
+from datetime import date
+from decimal import Decimal
 
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.utils import ImageReader
+# ReportLab, qrcode and Pillow are most of the start-up time, so they are
+# imported on first use (or in the background once the window is up)
+from invoice_core.forms import StaticForm
+from invoice_core.invoice import Invoice, build_invoice
+from invoice_core.ledger import Ledger
+from invoice_core.money import money, parse_qty, parse_rate, scaled
+from invoice_core.pages import paginate
+from invoice_core.totals import RunningTotals, make_line
+from invoice_core.words import amount_in_words
 
-try:
-    from PIL import Image, ImageTk                 # GUI logo
-except ImportError:
-    Image = ImageTk = None
+# item-table geometry (points): rows stop above the footer text on full pages
+# and above the QR code on the page that carries the totals
+ROW_STEP = 16
+FOOTER_TOP = 111
+TOTALS_BOTTOM = 186
 
-import qrcode                                       # QR code
+IMPORT_CHUNK = 250      # imported rows added to the table per event-loop turn
+ITEM_COLUMNS = ("desc", "hsn", "qty", "rate", "gst")
+# every issued invoice, so numbering survives restarts
+LEDGER_PATH = os.environ.get("INVOICE_LEDGER", "invoices.sqlite3")
 
 
-def money(val: Decimal) -> str:
-    """Format Decimal to 2-dp string."""
-    return f"{val.quantize(Decimal('0.01'), ROUND_HALF_UP)}"
+# Tkinter is loaded by _import_tk() for the window only, so --batch also runs
+# on servers whose Python was built without Tk
+tk = ttk = filedialog = messagebox = None
 
 
-class InvoiceGenerator:
-    """GUI app that produces a tax-invoice PDF."""
+def _import_tk():
+    global tk, ttk, filedialog, messagebox
+    import tkinter as tk
+    from tkinter import ttk, filedialog, messagebox
 
-    def __init__(self, root: tk.Tk) -> None:
-        self.root = root
-        self.root.title("Invoice Generator")
-        self.root.geometry("950x680")
 
-        # ─── runtime data ─────────────────────────────────────────────
-        self.items: list[dict] = []
-        self.invoice_number: int = 1
+def _import_pdf_modules():
+    """Load the PDF stack ahead of the first "Generate PDF" click."""
+    from reportlab import rl_config
+    from reportlab.pdfgen import canvas  # noqa: F401
+    from invoice_core import qr  # noqa: F401
+
+    # write compressed streams as binary; ASCII85 only makes every PDF ~25% larger
+    rl_config.useA85 = 0
 
+
+DEFAULT_GST = Decimal("18.0")  # %
+
+
+def item_line(s_no: int, desc: str, hsn: str, qty, rate, gst_rate):
+    """One invoice line; the GST rate is split evenly into CGST and SGST."""
+    half = parse_rate(gst_rate / 2)
+    return make_line(s_no, desc, hsn, parse_qty(qty), scaled(rate, 2), half, half)
+
+
+class InvoicePdf:
+    """Desktop invoice layout; needs no Tk, so batch workers use it too."""
+
+    def __init__(self) -> None:
         # ─── constants you may edit ──────────────────────────────────
         self.logo_path = "Bosch Logo.png"
         self.company_name = "SATYA SAI BABA AUTO ELECTRICAL WORKS"
@@ -47,8 +83,226 @@ class InvoiceGenerator:
         self.company_phone = "Cell : 9958592564   8074546541"
         self.gstin = "GSTIN : 37CYCP5977H1ZM"
 
+        # company block + footer, compiled once and reused by every PDF
+        self.letterhead = StaticForm("letterhead", self._draw_letterhead)
+        self.logo = None                   # ImageReader, loaded on first PDF
+
+    def render(self, target, invoice: Invoice, progress=None):
+        """Write ``invoice`` to ``target`` (a path or binary file).
+
+        The customer has ``name``, ``address``, ``vehicle``, ``jobcard`` and
+        ``po``.  ``progress(lines_done)`` is called after every page.
+        """
+        number, customer, items = invoice.inv_no, invoice.customer, invoice.lines
+        issued = invoice.date or date.today()
+        _import_pdf_modules()
+        from reportlab.lib.pagesizes import letter
+        from reportlab.lib.utils import ImageReader, simpleSplit
+        from reportlab.pdfgen import canvas
+        from invoice_core.qr import draw_qr          # cached QR code
+
+        if self.logo is None and os.path.isfile(self.logo_path):
+            self.logo = ImageReader(self.logo_path)
+
+        c = canvas.Canvas(target, pagesize=letter)
+        width, height = letter
+        self.letterhead.define(c)
+
+        def capacity(page_no, last):
+            # rows between the table header and the footer / totals block
+            top = (height - 245 if page_no == 1 else height - 190) - 18
+            bottom = TOTALS_BOTTOM if last else FOOTER_TOP
+            rows = int((top - bottom) // ROW_STEP) + 1
+            return rows - (page_no > 1) - (not last)
+
+        done = 0
+        for page in paginate(items, capacity):
+            if page.number > 1:
+                c.showPage()
+
+            # header logo + company
+            if self.logo is not None:
+                c.drawImage(
+                    self.logo,
+                    40,
+                    height - 100,
+                    width=60,
+                    preserveAspectRatio=True,
+                    mask="auto",
+                )
+            self.letterhead.place(c)
+
+            if page.number == 1:
+                self._draw_invoice_meta(c, number, customer, issued)
+                y = height - 245
+            else:
+                c.setFont("Helvetica-Bold", 14)
+                c.drawString(40, height - 160, "TAX INVOICE (continued)")
+                c.setFont("Helvetica-Bold", 12)
+                c.drawRightString(width - 40, height - 160, f"Invoice #: {number}")
+                y = height - 190
+
+            # table header
+            self._draw_table_header(c, y)
+
+            # rows
+            y -= 18
+            if page.brought is not None:
+                self._draw_carry(c, y, "Brought forward", page.brought)
+                y -= ROW_STEP
+            c.setFont("Helvetica", 10)
+            for it in page.lines:
+                c.drawString(45, y, str(it.s_no))
+                c.drawString(75, y, it.desc)
+                c.drawString(250, y, it.hsn)
+                c.drawRightString(330, y, it.qty_text)
+                c.drawRightString(390, y, money(it.rate))
+                c.drawRightString(455, y, money(it.taxable))
+                c.drawRightString(510, y, money(it.cgst))
+                c.drawRightString(565, y, money(it.sgst))
+                c.drawRightString(width - 45, y, money(it.amount))
+                y -= ROW_STEP
+
+            if not page.last:
+                c.line(390, y + 12, width - 40, y + 12)
+                self._draw_carry(c, y, "Carried forward", page.carried)
+            if page.number > 1 or not page.last:
+                c.setFont("Helvetica", 9)
+                c.drawCentredString(width / 2, 40, f"Page {page.number}")
+            done += len(page.lines)
+            if progress is not None:
+                progress(done)
+
+        # totals
+        taxable, cgst, sgst, net = invoice.totals
+        c.line(390, y + 5, width - 40, y + 5)
+        c.setFont("Helvetica-Bold", 11)
+        c.drawRightString(420, y - 10, "Totals :")
+        c.drawRightString(455, y - 10, money(taxable))
+        c.drawRightString(510, y - 10, money(cgst))  
+        c.drawRightString(565, y - 10, money(sgst))
+        c.drawRightString(width - 45, y - 10, money(net))
+
+        # amount in words, wrapped to stay clear of the QR code
+        c.setFont("Helvetica-Oblique", 9)
+        c.drawString(40, y - 30, "Amount in Words:")
+        c.setFont("Helvetica-Bold", 9)
+        for i, line in enumerate(simpleSplit(amount_in_words(net), "Helvetica-Bold", 9, 430)):
+            c.drawString(40, y - 42 - 11 * i, line)
+
+        # QR code
+        qr_data = f"{self.gstin}|{number}|{issued:%d%m%Y}|{money(net)}"
+        draw_qr(c, qr_data, width - 120, 80, 70)
+
+        c.save()
+
+    def _draw_letterhead(self, c):
+        from reportlab.lib.pagesizes import letter
+
+        width, height = letter
+        tx = 110 if os.path.isfile(self.logo_path) else 40
+        c.setFont("Helvetica-Bold", 14)
+        c.drawString(tx, height - 40, self.company_name)
+        c.setFont("Helvetica", 11)
+        for i, line in enumerate(
+            [
+                self.company_tag,
+                self.company_addr_1,
+                self.company_addr_2,
+                self.company_state,
+                self.company_phone,
+                self.gstin,
+            ],
+            start=1,
+        ):
+            c.drawString(tx, height - 40 - 15 * i, line)
+
+        # footer text
+        c.setFont("Helvetica", 10)
+        c.drawString(
+            40,
+            70,
+            "Goods once sold cannot be taken back. Disputes are subject to Gudivada jurisdiction only.",
+        )
+        c.drawRightString(width - 40, 70, f"For {self.company_name}")
+        c.drawRightString(width - 40, 55, "Proprietor")
+
+    def _draw_invoice_meta(self, c, number, customer, issued):
+        from reportlab.lib.pagesizes import letter
+
+        width, height = letter
+        # invoice meta
+        c.setFont("Helvetica-Bold", 18)
+        c.drawString(40, height - 160, "TAX INVOICE")
+        c.setFont("Helvetica-Bold", 12)
+        c.drawRightString(width - 40, height - 160, f"Invoice #: {number}")
+        c.drawRightString(
+            width - 40, height - 175, f"Date : {issued:%d-%m-%Y}"
+        )
+
+        # customer block
+        c.setFont("Helvetica-Bold", 12)
+        c.drawString(40, height - 200, "Bill To :")
+        c.setFont("Helvetica", 11)
+        c.drawString(100, height - 200, customer.get("name", ""))
+        c.drawString(100, height - 215, customer.get("address", ""))
+        meta_y = height - 200
+        c.drawString(width - 300, meta_y, f"Vehicle No.: {customer.get('vehicle', '')}")
+        c.drawString(width - 300, meta_y - 15, f"Job-Card No.: {customer.get('jobcard', '')}")
+        c.drawString(width - 300, meta_y - 30, f"PO No.: {customer.get('po', '')}")
+
+    def _draw_table_header(self, c, y):
+        from reportlab.lib.pagesizes import letter
+
+        width, _ = letter
+        c.setFont("Helvetica-Bold", 11)
+        headers = [
+            ("Sl.", 45),
+            ("Description", 75),
+            ("HSN", 250),
+            ("Qty", 300),
+            ("Rate", 340),
+            ("Taxable", 400),
+            ("CGST", 465),
+            ("SGST", 520),
+            ("Amount", 575),
+        ]
+        for text, x in headers:
+            c.drawString(x, y, text)
+        c.line(40, y - 3, width - 40, y - 3)
+
+    def _draw_carry(self, c, y, label, carry):
+        from reportlab.lib.pagesizes import letter
+
+        width, _ = letter
+        c.setFont("Helvetica-Bold", 10)
+        c.drawString(75, y, label)
+        c.drawRightString(455, y, money(carry.taxable))
+        c.drawRightString(510, y, money(carry.cgst))
+        c.drawRightString(565, y, money(carry.sgst))
+        c.drawRightString(width - 45, y, money(carry.amount))
+
+
+class InvoiceGenerator:
+    """GUI app that produces a tax-invoice PDF."""
+
+    def __init__(self, root: "tk.Tk", ledger_path: str = LEDGER_PATH) -> None:
+        _import_tk()
+        self.root = root
+        self.root.title("Invoice Generator")
+        self.root.geometry("950x680")
+
+        # ─── runtime data ─────────────────────────────────────────────
+        self.items: list = []              # invoice_core.totals.Line
+        self.running = RunningTotals()     # sums of self.items, O(1) per add
+        self.ledger = open_ledger(ledger_path)
+        self.invoice_number: int = self.ledger.next_number()
+        self.pdf = InvoicePdf()            # company details + PDF layout
+        self.logo_path = self.pdf.logo_path
+        self.company_name = self.pdf.company_name
+
         # GST defaults
-        self.default_gst = Decimal("18.0")  # %
+        self.default_gst = DEFAULT_GST
         self.cgst_rate = self.default_gst / 2
         self.sgst_rate = self.default_gst / 2
 
@@ -66,13 +320,10 @@ class InvoiceGenerator:
         # ── header (logo + company) ──────────────────────────────────
         header = ttk.Frame(main)
         header.grid(row=0, column=0, sticky="ew")
-        if ImageTk and os.path.isfile(self.logo_path):
-            img = Image.open(self.logo_path).resize((70, 70))
-            self.tk_logo = ImageTk.PhotoImage(img)
-            tk.Label(header, image=self.tk_logo).pack(side=tk.LEFT, padx=5)
-        tk.Label(
+        self.company_label = tk.Label(
             header, text=self.company_name, font=("Arial", 20, "bold"), fg="#0A4D91"
-        ).pack(side=tk.LEFT, padx=10)
+        )
+        self.company_label.pack(side=tk.LEFT, padx=10)
 
         # ── customer / meta info ─────────────────────────────────────
         cust = ttk.LabelFrame(main, text="Customer & Job Information", padding=10)
@@ -97,6 +348,8 @@ class InvoiceGenerator:
         self.vehicle_no.grid(row=0, column=3, padx=4)
         self.job_card.grid(row=1, column=3, padx=4)
         self.po_no.grid(row=0, column=5, padx=4)
+        history_b = ttk.Button(cust, text="Past Job Cards", command=self.show_history)
+        history_b.grid(row=1, column=5, padx=4, sticky="e")
 
         # ── item entry ───────────────────────────────────────────────
         add = ttk.LabelFrame(main, text="Add Item", padding=10)
@@ -123,9 +376,12 @@ class InvoiceGenerator:
         self.gst_e.grid(row=4, column=1, padx=4, pady=2, sticky="w")
         self.gst_e.insert(0, str(self.default_gst))
 
-        ttk.Button(add, text="Add Item", command=self.add_item).grid(
-            row=4, column=2, padx=10
-        )
+        add_b = ttk.Button(add, text="Add Item", command=self.add_item)
+        add_b.grid(row=4, column=2, padx=10)
+        import_b = ttk.Button(add, text="Import Items…", command=self.import_items)
+        import_b.grid(row=3, column=2, padx=10)
+        paste_b = ttk.Button(add, text="Paste Items", command=self.paste_items)
+        paste_b.grid(row=2, column=2, padx=10)
 
         # ── items table ──────────────────────────────────────────────
         items_f = ttk.LabelFrame(main, text="Invoice Items", padding=10)
@@ -177,24 +433,76 @@ class InvoiceGenerator:
         # ── action buttons ───────────────────────────────────────────
         act = ttk.Frame(main, padding=10)
         act.grid(row=5, column=0, sticky="e")
-        ttk.Button(act, text="Generate Invoice", command=self.generate_pdf).pack(
-            side=tk.LEFT, padx=5
-        )
-        ttk.Button(act, text="Clear All", command=self.clear_all).pack(
-            side=tk.LEFT, padx=5
-        )
+        # shown only while a PDF renders or items import
+        self.status_l = ttk.Label(act)
+        self.progress = ttk.Progressbar(act, length=200, mode="determinate")
+        generate_b = ttk.Button(act, text="Generate Invoice", command=self.generate_pdf)
+        generate_b.pack(side=tk.LEFT, padx=5)
+        clear_b = ttk.Button(act, text="Clear All", command=self.clear_all)
+        clear_b.pack(side=tk.LEFT, padx=5)
+        self.action_buttons = (add_b, import_b, paste_b, generate_b, clear_b)
 
         # resize rules
         main.columnconfigure(0, weight=1)
         main.rowconfigure(3, weight=1)
 
+        # show the window first, then fill in the logo and load the PDF stack
+        self.root.after_idle(self._show_logo)
+        self.root.after(200, threading.Thread(target=_import_pdf_modules, daemon=True).start)
+
     # ─────────────────── internal helpers ────────────────────────────
+    def _show_logo(self):
+        if not os.path.isfile(self.logo_path):
+            return
+        try:
+            from PIL import Image, ImageTk
+        except ImportError:
+            return
+        img = Image.open(self.logo_path).resize((70, 70))
+        self.tk_logo = ImageTk.PhotoImage(img)
+        tk.Label(self.company_label.master, image=self.tk_logo).pack(
+            side=tk.LEFT, padx=5, before=self.company_label
+        )
+
     def _calc_totals(self):
-        taxable = sum(item["taxable"] for item in self.items)
-        cgst = sum(item["cgst"] for item in self.items)
-        sgst = sum(item["sgst"] for item in self.items)
-        net = taxable + cgst + sgst
-        return taxable, cgst, sgst, net
+        taxable, cgst, sgst, _ = self.running.totals()
+        return taxable, cgst, sgst, self.running.exact_total()
+
+    def _append_lines(self, lines):
+        """Add priced lines to the invoice, the table and the totals."""
+        for it in lines:
+            self.items.append(it)
+            self.tree.insert(
+                "",
+                "end",
+                values=(
+                    it.s_no,
+                    it.desc,
+                    it.hsn,
+                    it.qty_text,
+                    money(it.rate),
+                    money(it.taxable),
+                    money(it.cgst),
+                    money(it.sgst),
+                    money(it.amount),
+                ),
+            )
+        self.running = self.running.add(lines)
+        self._refresh_totals_display()
+
+    def _set_busy(self, text, steps):
+        for b in self.action_buttons:
+            b.state(["disabled"])
+        self.progress.configure(maximum=max(steps, 1), value=0)
+        self.status_l.config(text=text)
+        self.status_l.pack(side=tk.LEFT, padx=5, before=self.action_buttons[3])
+        self.progress.pack(side=tk.LEFT, padx=5, before=self.action_buttons[3])
+
+    def _set_idle(self):
+        self.status_l.pack_forget()
+        self.progress.pack_forget()
+        for b in self.action_buttons:
+            b.state(["!disabled"])
 
     def _refresh_totals_display(self):
         taxable, cgst, sgst, net = self._calc_totals()
@@ -218,39 +526,7 @@ class InvoiceGenerator:
             messagebox.showerror("Input Error", "Invalid item details.")
             return
 
-        taxable = qty * rate
-        cgst = taxable * gst_rate / 200  # half of GST
-        sgst = taxable * gst_rate / 200
-        net = taxable + cgst + sgst
-
-        self.items.append(
-            dict(
-                desc=desc,
-                hsn=hsn,
-                qty=qty,
-                rate=rate,
-                taxable=taxable,
-                cgst=cgst,
-                sgst=sgst,
-                net=net,
-            )
-        )
-        self.tree.insert(
-            "",
-            "end",
-            values=(
-                len(self.items),
-                desc,
-                hsn,
-                qty,
-                money(rate),
-                money(taxable),
-                money(cgst),
-                money(sgst),
-                money(net),
-            ),
-        )
-        self._refresh_totals_display()
+        self._append_lines([item_line(len(self.items) + 1, desc, hsn, qty, rate, gst_rate)])
 
         # clear entry widgets
         for e in (self.desc_e, self.hsn_e, self.qty_e, self.rate_e):
@@ -258,6 +534,65 @@ class InvoiceGenerator:
         self.gst_e.delete(0, tk.END)
         self.gst_e.insert(0, str(self.default_gst))
 
+    def import_items(self):
+        path = filedialog.askopenfilename(
+            title="Import items",
+            filetypes=[("CSV files", "*.csv *.txt"), ("All files", "*.*")],
+        )
+        if not path:
+            return
+        name = os.path.basename(path)
+        try:
+            with open(path, newline="", encoding="utf-8-sig") as f:
+                text = f.read()
+        except UnicodeDecodeError:
+            messagebox.showerror("Import Items", f"{name} is not UTF-8 text.\n"
+                                 "In Excel, save it as \"CSV UTF-8\" and import it again.")
+            return
+        except OSError as e:
+            messagebox.showerror("Import Items", f"Could not read {name}:\n{e.strerror or e}")
+            return
+        self._import_rows(text, name)
+
+    def paste_items(self):
+        try:
+            text = self.root.clipboard_get()
+        except tk.TclError:
+            messagebox.showerror("Paste Items", "The clipboard is empty.")
+            return
+        self._import_rows(text, "clipboard")
+
+    def _import_rows(self, text, source):
+        """Add item rows a chunk per event-loop turn so the window stays live."""
+        rows = list(read_item_rows(text))
+        if not rows:
+            messagebox.showinfo("Import Items", f"No items found in {source}.")
+            return
+        pending, skipped = iter(rows), []
+        self._set_busy(f"Importing {len(rows)} rows…", len(rows))
+
+        def step(done):
+            chunk = list(islice(pending, IMPORT_CHUNK))
+            lines = []
+            for n, item in chunk:
+                try:
+                    lines.append(parse_item(len(self.items) + len(lines) + 1, item))
+                except ValueError as e:
+                    skipped.append(f"row {n}: {e}")
+            self._append_lines(lines)
+            done += len(chunk)
+            self.progress["value"] = done
+            if done < len(rows):
+                self.root.after(1, step, done)
+                return
+            self._set_idle()
+            msg = f"Imported {done - len(skipped)} item(s) from {source}."
+            if skipped:
+                msg += f"\nSkipped {len(skipped)}:\n" + "\n".join(skipped[:10])
+            messagebox.showinfo("Import Items", msg)
+
+        step(0)
+
     def generate_pdf(self):
         if not self.items:
             messagebox.showerror("No Items", "Add at least one item.")
@@ -266,123 +601,71 @@ class InvoiceGenerator:
             messagebox.showerror("Missing", "Enter customer name.")
             return
 
-        pdf_name = f"invoice_{self.invoice_number:04}.pdf"
-        c = canvas.Canvas(pdf_name, pagesize=letter)
-        width, height = letter
-
-        # header logo + company
-        if os.path.isfile(self.logo_path):
-            c.drawImage(
-                ImageReader(self.logo_path),
-                40,
-                height - 100,
-                width=60,
-                preserveAspectRatio=True,
-                mask="auto",
-            )
-        tx = 110 if os.path.isfile(self.logo_path) else 40
-        c.setFont("Helvetica-Bold", 14)
-        c.drawString(tx, height - 40, self.company_name)
-        c.setFont("Helvetica", 11)
-        for i, line in enumerate(
-            [
-                self.company_tag,
-                self.company_addr_1,
-                self.company_addr_2,
-                self.company_state,
-                self.company_phone,
-                self.gstin,
-            ],
-            start=1,
-        ):
-            c.drawString(tx, height - 40 - 15 * i, line)
-
-        # invoice meta
-        c.setFont("Helvetica-Bold", 18)
-        c.drawString(40, height - 160, "TAX INVOICE")
-        c.setFont("Helvetica-Bold", 12)
-        c.drawRightString(width - 40, height - 160, f"Invoice #: {self.invoice_number:04}")
-        c.drawRightString(
-            width - 40, height - 175, f"Date : {datetime.now():%d-%m-%Y}"
-        )
-
-        # customer block
-        c.setFont("Helvetica-Bold", 12)
-        c.drawString(40, height - 200, "Bill To :")
-        c.setFont("Helvetica", 11)
-        c.drawString(100, height - 200, self.customer_name.get().strip())
-        c.drawString(100, height - 215, self.customer_addr.get().strip())
-        meta_y = height - 200
-        c.drawString(width - 300, meta_y, f"Vehicle No.: {self.vehicle_no.get().strip()}")
-        c.drawString(width - 300, meta_y - 15, f"Job-Card No.: {self.job_card.get().strip()}")
-        c.drawString(width - 300, meta_y - 30, f"PO No.: {self.po_no.get().strip()}")
-
-        # table header
-        y = height - 245
-        c.setFont("Helvetica-Bold", 11)
-        headers = [
-            ("Sl.", 45),
-            ("Description", 75),
-            ("HSN", 250),
-            ("Qty", 300),
-            ("Rate", 340),
-            ("Taxable", 400),
-            ("CGST", 465),
-            ("SGST", 520),
-            ("Amount", 575),
-        ]
-        for text, x in headers:
-            c.drawString(x, y, text)
-        c.line(40, y - 3, width - 40, y - 3)
-
-        # rows
-        y -= 18
-        c.setFont("Helvetica", 10)
-        for idx, it in enumerate(self.items, 1):
-            c.drawString(45, y, str(idx))
-            c.drawString(75, y, it["desc"])
-            c.drawString(250, y, it["hsn"])
-            c.drawRightString(330, y, str(it["qty"]))
-            c.drawRightString(390, y, money(it["rate"]))
-            c.drawRightString(455, y, money(it["taxable"]))
-            c.drawRightString(510, y, money(it["cgst"]))
-            c.drawRightString(565, y, money(it["sgst"]))
-            c.drawRightString(width - 45, y, money(it["net"]))
-            y -= 16
-
-        # totals
-        taxable, cgst, sgst, net = self._calc_totals()
-        c.line(390, y + 5, width - 40, y + 5)
-        c.setFont("Helvetica-Bold", 11)
-        c.drawRightString(420, y - 10, "Totals :")
-        c.drawRightString(455, y - 10, money(taxable))
-        c.drawRightString(510, y - 10, money(cgst))  
-        c.drawRightString(565, y - 10, money(sgst))
-        c.drawRightString(width - 45, y - 10, money(net))
-
-        # footer text
-        c.setFont("Helvetica", 10)
-        c.drawString(
-            40,
-            70,
-            "Goods once sold cannot be taken back. Disputes are subject to Gudivada jurisdiction only.",
-        )
-        c.drawRightString(width - 40, 70, f"For {self.company_name}")
-        c.drawRightString(width - 40, 55, "Proprietor")
-
-        # QR code
-        qr_data = f"{self.gstin}|{self.invoice_number:04}|{datetime.now():%d%m%Y}|{money(net)}"
-        qr_img = qrcode.make(qr_data)
-        buf = BytesIO()
-        qr_img.save(buf)
-        buf.seek(0)
-        c.drawImage(ImageReader(buf), width - 120, 80, 70, 70)
-
-        c.save()
+        customer = {
+            "name": self.customer_name.get().strip(),
+            "address": self.customer_addr.get().strip(),
+            "vehicle": self.vehicle_no.get().strip(),
+            "jobcard": self.job_card.get().strip(),
+            "po": self.po_no.get().strip(),
+        }
+        lines = tuple(self.items)
+        # the ledger takes the number before anything is drawn
+        try:
+            number = self.ledger.record(customer, lines)
+        except sqlite3.Error as e:
+            messagebox.showerror("Ledger Error", f"Could not record the invoice:\n{e}")
+            return
+        pdf_name = f"invoice_{number:04}.pdf"
+        invoice = desktop_invoice(number, customer, lines)
+        # render on a worker thread; it only talks to Tk through this queue
+        events = queue.Queue()
+
+        def work():
+            try:
+                self.pdf.render(pdf_name, invoice,
+                                progress=lambda done: events.put(("progress", done)))
+                events.put(("done", None))
+            except Exception as e:
+                events.put(("error", e))
+
+        self._set_busy(f"Creating {pdf_name}…", len(lines))
+        threading.Thread(target=work, daemon=True).start()
+        self.root.after(50, self._poll_render, events, pdf_name, number)
+
+    def _poll_render(self, events, pdf_name, number):
+        kind = None
+        while kind in (None, "progress"):
+            try:
+                kind, value = events.get_nowait()
+            except queue.Empty:
+                self.root.after(50, self._poll_render, events, pdf_name, number)
+                return
+            if kind == "progress":
+                self.progress["value"] = value
+        self._set_idle()
+        if kind == "error":
+            self.ledger.discard(number)    # so the retry gets the same number
+            messagebox.showerror("PDF Error", f"Could not create {pdf_name}:\n{value}")
+            return
         messagebox.showinfo("Done", f"Created {pdf_name}")
-        self.invoice_number += 1
+        self.invoice_number = number + 1
         self.clear_all()
 
+    def show_history(self):
+        """List earlier invoices for the vehicle, or else the customer, entered."""
+        name, vehicle = self.customer_name.get().strip(), self.vehicle_no.get().strip()
+        if not (name or vehicle):
+            messagebox.showerror("Past Job Cards", "Enter a vehicle number or customer name.")
+            return
+        rows = self.ledger.find(customer=name, vehicle=vehicle)
+        if not rows:
+            messagebox.showinfo("Past Job Cards", f"No invoices for {vehicle or name}.")
+            return
+        messagebox.showinfo("Past Job Cards", "\n".join(
+            f"{r['number']:04}  {r['issued']}  Job-Card {r['job_card'] or '-'}  "
+            f"{r['vehicle'] or '-'}  {r['customer']}  Rs. {money(r['total'])}"
+            for r in rows))
+
     def clear_all(self):
         # clear all entries and table
         for widget in (
@@ -402,10 +685,254 @@ class InvoiceGenerator:
         for item in self.tree.get_children():
             self.tree.delete(item)
         self.items.clear()
+        self.running = RunningTotals()
         self._refresh_totals_display()
 
 
-if __name__ == "__main__":
+def desktop_invoice(number: int, customer: dict, lines, issued: date = None) -> Invoice:
+    """Invoice ``number`` with the totals this app prints: the grand total is
+    rounded once from the exact line amounts (``RunningTotals.exact_total``)."""
+    return build_invoice(f"{number:04}", customer, lines, date=issued, exact_total=True)
+
+
+def open_ledger(path: str, pdf_dir: str = ".") -> Ledger:
+    """The ledger at ``path``; a new one continues after the highest
+    ``invoice_NNNN.pdf`` in ``pdf_dir``, so PDFs written before the ledger
+    existed are never overwritten."""
+    def seed():
+        found = (re.fullmatch(r"invoice_(\d+)\.pdf", name) for name in os.listdir(pdf_dir))
+        return max((int(m.group(1)) for m in found if m), default=0) + 1
+    return Ledger(path, seed=seed)
+
+
+# ─────────────────── headless batch mode ─────────────────────────────
+def read_batch(path: str):
+    """Yield ``(source, record)`` for each invoice in a JSONL or CSV file.
+
+    A JSONL line is ``{"invoice_no": 12, "date": "2026-04-01", "customer":
+    {"name", "address", "vehicle", "jobcard", "po"}, "items": [{"desc",
+    "hsn", "qty", "rate", "gst"}, ...]}``; ``invoice_no``, ``date`` and an
+    item's ``gst`` (default 18 %) are optional.  A CSV has one row per item
+    with columns ``invoice_no, date, name, address, vehicle, jobcard, po,
+    desc, hsn, qty, rate, gst``; rows sharing an ``invoice_no`` form one
+    invoice.  ``invoice_no`` may be left blank (or the column left out) so
+    the ledger numbers the invoice: such a row starts a new invoice when it
+    has a ``name`` and otherwise adds an item to the invoice on the row
+    above.  ``source`` ("line 3", "row 7") is used in error messages.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        if not path.lower().endswith(".csv"):
+            for n, line in enumerate(f, 1):
+                if line.strip():
+                    try:
+                        yield f"line {n}", json.loads(line)
+                    except ValueError as e:
+                        yield f"line {n}", e
+            return
+        grouped = {}
+        key = None                           # the invoice on the row above
+        for n, row in enumerate(csv.DictReader(f), 2):
+            number = (row.get("invoice_no") or "").strip()
+            if number:
+                key = number
+            elif (row.get("name") or "").strip():
+                key = n                          # unnumbered: the ledger assigns one
+            elif key is None:
+                yield f"row {n}", ValueError("neither invoice_no nor name is given")
+                continue
+            if key not in grouped:
+                customer = {k: row.get(k) or "" for k in ("name", "address", "vehicle", "jobcard", "po")}
+                grouped[key] = (f"row {n}", {"invoice_no": number or None, "date": row.get("date"),
+                                             "customer": customer, "items": []})
+            grouped[key][1]["items"].append(
+                {k: row.get(k) for k in ("desc", "hsn", "qty", "rate", "gst")})
+        yield from grouped.values()
+
+
+def _decimal(value, default=None) -> Decimal:
+    text = "" if value is None else str(value).strip()
+    if not text:
+        if default is None:
+            raise ValueError("missing number")
+        return default
+    try:
+        return Decimal(text)
+    except ArithmeticError:
+        raise ValueError(f"not a number: {text!r}") from None
+
+
+def parse_item(s_no: int, item: dict):
+    """Line ``s_no`` from a ``desc, hsn, qty, rate, gst`` dict of strings or
+    numbers; ``qty`` defaults to 1 and ``gst`` to 18 %."""
+    desc = str(item.get("desc") or "").strip()
+    qty = _decimal(item.get("qty"), Decimal(1))
+    rate = _decimal(item.get("rate"))
+    gst_rate = _decimal(item.get("gst"), DEFAULT_GST)
+    if not desc:
+        raise ValueError("description is missing")
+    if qty <= 0 or rate <= 0 or gst_rate < 0:
+        raise ValueError(f"qty {qty}, rate {rate} or GST {gst_rate}% out of range")
+    return item_line(s_no, desc, str(item.get("hsn") or "").strip(), qty, rate, gst_rate)
+
+
+def read_item_rows(text: str):
+    """Yield ``(row, item)`` from CSV or tab-separated text (a file or a
+    spreadsheet paste).  A first row naming the columns sets their order;
+    without one they are ``desc, hsn, qty, rate, gst``."""
+    first = text.split("\n", 1)[0]
+    reader = csv.reader(io.StringIO(text), delimiter="\t" if "\t" in first else ",")
+    columns = ITEM_COLUMNS
+    for n, row in enumerate(reader, 1):
+        cells = [cell.strip() for cell in row]
+        if not any(cells):
+            continue
+        if n == 1 and "desc" in (c.lower() for c in cells):
+            columns = [c.lower() for c in cells]
+            continue
+        yield n, dict(zip(columns, cells))
+
+
+def parse_record(record: dict):
+    """``(number or None, customer, lines, issued)``; ``ValueError`` if invalid."""
+    if isinstance(record, Exception):
+        raise ValueError(record)
+    try:
+        number = record.get("invoice_no")
+        number = int(number) if number not in (None, "") else None
+        issued = record.get("date")
+        issued = date.fromisoformat(issued) if issued else date.today()
+        customer = {k: str(v or "").strip() for k, v in record["customer"].items()}
+        lines = []
+        for i, item in enumerate(record["items"], 1):
+            try:
+                lines.append(parse_item(i, item))
+            except ValueError as e:
+                raise ValueError(f"item {i}: {e}") from None
+    except (KeyError, TypeError, AttributeError) as e:
+        raise ValueError(f"{type(e).__name__}: {e}") from e
+    if not customer.get("name"):
+        raise ValueError("customer name is missing")
+    if not lines:
+        raise ValueError("no items")
+    return number, customer, lines, issued
+
+
+_BATCH_PDF = None                          # one InvoicePdf per worker process
+
+
+def _render_to_file(path: str, invoice: Invoice) -> None:
+    global _BATCH_PDF
+    if _BATCH_PDF is None:
+        _BATCH_PDF = InvoicePdf()
+    tmp = f"{path}.tmp"
+    _BATCH_PDF.render(tmp, invoice)
+    os.replace(tmp, path)                  # never leave a half-written PDF
+
+
+def _discard(ledger, issued_now, source):
+    if source in issued_now:
+        ledger.discard(issued_now[source])
+
+
+def run_batch(path: str, out_dir: str, jobs: int, start: int = None,
+              ledger: Ledger = None) -> int:
+    """Render every invoice in ``path`` to ``out_dir/invoice_NNNN.pdf``.
+
+    Records keep their own ``invoice_no`` (reprints); the rest are new
+    invoices numbered from ``start`` in file order, skipping numbers already
+    taken.  With a ``ledger``, ``start`` defaults to its next number and new
+    invoices are recorded in it before rendering.  ``jobs`` worker processes
+    render in parallel (0 renders in this process).  Prints a summary and
+    returns the exit status.
+    """
+    started = time.perf_counter()
+    failures, invoices = [], []
+    for source, record in read_batch(path):
+        try:
+            invoices.append((source, *parse_record(record)))
+        except ValueError as e:
+            failures.append((source, f"invalid record: {e}"))
+
+    if start is None:
+        start = ledger.next_number() if ledger else 1
+    taken = {inv[1] for inv in invoices if inv[1] is not None}
+    used, work, next_no, issued_now = set(), [], start, {}
+    for source, number, customer, lines, issued in invoices:
+        new = number is None
+        if new:
+            while next_no in taken:
+                next_no += 1
+            number, next_no = next_no, next_no + 1
+        if number in used:
+            failures.append((source, f"duplicate invoice number {number:04}"))
+            continue
+        if new and ledger:
+            try:
+                ledger.record(customer, lines, issued, number=number)
+            except sqlite3.IntegrityError:
+                failures.append((source, f"invoice {number:04} is already in the ledger"))
+                continue
+            issued_now[source] = number
+        used.add(number)
+        pdf_path = os.path.join(out_dir, f"invoice_{number:04}.pdf")
+        work.append((source, (pdf_path, desktop_invoice(number, customer, lines, issued))))
+
+    os.makedirs(out_dir, exist_ok=True)
+    done = 0
+    if jobs <= 0:
+        for source, job in work:
+            try:
+                _render_to_file(*job)
+                done += 1
+            except Exception as e:
+                failures.append((source, f"render failed: {e}"))
+                _discard(ledger, issued_now, source)
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = {pool.submit(_render_to_file, *job): source for source, job in work}
+            for fut in as_completed(futures):
+                try:
+                    fut.result()
+                    done += 1
+                except Exception as e:
+                    failures.append((futures[fut], f"render failed: {e}"))
+                    _discard(ledger, issued_now, futures[fut])
+
+    elapsed = time.perf_counter() - started
+    numbers = sorted(used)
+    span = f" ({numbers[0]:04}-{numbers[-1]:04})" if numbers else ""
+    print(f"Rendered {done} invoice(s){span} to {out_dir} in {elapsed:.1f}s, "
+          f"{done / elapsed:.1f}/s with {jobs or 1} process(es); {len(failures)} failed")
+    for source, reason in failures:
+        print(f"  {source}: {reason}")
+    return 1 if failures else 0
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(
+        description="Tax-invoice generator; opens the window unless --batch is given.")
+    ap.add_argument("--batch", metavar="FILE",
+                    help="render every invoice in a .jsonl or .csv file, without a window")
+    ap.add_argument("--out", default=".", help="directory for batch PDFs (default: .)")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                    help="worker processes for --batch (default: CPU count, 0 = none)")
+    ap.add_argument("--start", type=int,
+                    help="first number for records without an invoice_no "
+                         "(default: the ledger's next number)")
+    ap.add_argument("--ledger", default=LEDGER_PATH,
+                    help=f"SQLite ledger of issued invoices (default: {LEDGER_PATH})")
+    args = ap.parse_args(argv)
+
+    if args.batch:
+        os.makedirs(args.out, exist_ok=True)
+        return run_batch(args.batch, args.out, args.jobs, args.start,
+                         open_ledger(args.ledger, args.out))
+    _import_tk()
     root = tk.Tk()
-    app = InvoiceGenerator(root)
-    root.mainloop()
\ No newline at end of file
+    InvoiceGenerator(root, args.ledger)
+    root.mainloop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
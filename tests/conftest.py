@@ -0,0 +1,28 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# invoice_core and benchmarks from the repo root; the web app's modules
+# (app, render, payload, rollups, ...) import each other from invoice-app
+sys.path[:0] = [ROOT, os.path.join(ROOT, "invoice-app")]
+
+
+@pytest.fixture(scope="session")
+def web(tmp_path_factory):
+    """The web app module on an in-memory SQLite database."""
+    from benchmarks.__main__ import _setup_env
+    _setup_env(str(tmp_path_factory.mktemp("app")))   # app.py reads its config at import
+    import app
+    with app.APP.app_context():
+        app.db.create_all()
+    return app
+
+
+@pytest.fixture
+def empty_db(web):
+    with web.APP.app_context():
+        for t in reversed(web.db.metadata.sorted_tables):
+            web.db.session.execute(t.delete())
+        web.db.session.commit()
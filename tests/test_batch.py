@@ -0,0 +1,63 @@
+import sys
+
+import pytest
+
+HEADER = "invoice_no,date,name,address,vehicle,jobcard,po,desc,hsn,qty,rate,gst\n"
+
+
+@pytest.fixture
+def ig(monkeypatch):
+    # --batch has to work where Python has no Tk
+    monkeypatch.setitem(sys.modules, "tkinter", None)
+    monkeypatch.delitem(sys.modules, "invoice_generator", raising=False)
+    import invoice_generator
+    return invoice_generator
+
+
+def _records(ig, tmp_path, text):
+    path = tmp_path / "batch.csv"
+    path.write_text(text, encoding="utf-8")
+    return [(src, rec if isinstance(rec, Exception) else
+             (rec["invoice_no"], rec["customer"]["name"], [i["desc"] for i in rec["items"]]))
+            for src, rec in ig.read_batch(str(path))]
+
+
+def test_csv_rows_group_by_invoice_no(ig, tmp_path):
+    assert _records(ig, tmp_path, HEADER +
+                    "7,,Ravi,,,,,Brush,8511,2,120.50,18\n"
+                    "8,,Sita,,,,,Oil,2710,1,300,18\n"
+                    "7,,Ravi,,,,,Bearing,8482,1,80,18\n") == [
+        ("row 2", ("7", "Ravi", ["Brush", "Bearing"])),
+        ("row 3", ("8", "Sita", ["Oil"])),
+    ]
+
+
+def test_csv_invoice_no_is_optional(ig, tmp_path):
+    records = _records(ig, tmp_path, HEADER +
+                       ",,Ravi,,,,,Brush,8511,2,120.50,18\n"
+                       ",,,,,,,Bearing,8482,1,80,18\n"
+                       ",,Ravi,,,,,Oil,2710,1,300,18\n")
+    assert records == [("row 2", (None, "Ravi", ["Brush", "Bearing"])),
+                       ("row 4", (None, "Ravi", ["Oil"]))]
+
+
+def test_csv_without_invoice_no_column(ig, tmp_path):
+    text = "name,desc,qty,rate\nRavi,Brush,2,120.50\n,Bearing,1,80\n"
+    assert _records(ig, tmp_path, text) == [("row 2", (None, "Ravi", ["Brush", "Bearing"]))]
+
+
+def test_csv_item_with_nothing_to_join(ig, tmp_path):
+    (src, err), = _records(ig, tmp_path, HEADER + ",,,,,,,Brush,8511,2,120.50,18\n")
+    assert src == "row 2" and isinstance(err, ValueError)
+
+
+def test_batch_run_numbers_csv_invoices_from_the_ledger(ig, tmp_path):
+    batch = tmp_path / "new.csv"
+    batch.write_text(HEADER +
+                     ",2026-10-01,Ravi,Main Rd,AP16 1,JC1,,Brush,8511,2,120.50,18\n"
+                     ",2026-10-02,Sita,Lake Rd,AP16 2,JC2,,Oil,2710,1.5,300,\n", encoding="utf-8")
+    out = tmp_path / "out"
+    assert ig.main(["--batch", str(batch), "--out", str(out), "--jobs", "0",
+                    "--ledger", str(tmp_path / "ledger.sqlite3")]) == 0
+    assert sorted(p.name for p in out.glob("*.pdf")) == ["invoice_0001.pdf", "invoice_0002.pdf"]
+    assert "tkinter" not in sys.modules or sys.modules["tkinter"] is None
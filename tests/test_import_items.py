@@ -0,0 +1,52 @@
+import types
+
+import pytest
+
+import invoice_generator as ig
+
+
+@pytest.fixture
+def gui(monkeypatch):
+    """An ``InvoiceGenerator`` without a window: the file dialog answers
+    ``gui.pick`` and message boxes are recorded in ``gui.shown``."""
+    g = object.__new__(ig.InvoiceGenerator)
+    g.pick, g.shown, g.imported = "", [], []
+    monkeypatch.setattr(ig, "filedialog", types.SimpleNamespace(
+        askopenfilename=lambda **kw: g.pick))
+    monkeypatch.setattr(ig, "messagebox", types.SimpleNamespace(
+        showerror=lambda *a: g.shown.append(("error",) + a),
+        showinfo=lambda *a: g.shown.append(("info",) + a)))
+    g._import_rows = lambda text, source: g.imported.append((text, source))
+    return g
+
+
+def test_imports_utf8_csv(gui, tmp_path):
+    path = tmp_path / "items.csv"
+    path.write_bytes("﻿desc,qty,rate\r\nBrush – 12 V,2,120.50\r\n".encode("utf-8"))
+    gui.pick = str(path)
+    gui.import_items()
+    assert gui.imported == [("desc,qty,rate\r\nBrush – 12 V,2,120.50\r\n", "items.csv")]
+    assert gui.shown == []
+
+
+def test_cp1252_csv_is_reported(gui, tmp_path):
+    path = tmp_path / "excel.csv"
+    path.write_bytes("desc,qty,rate\r\nBrush – 12 V,2,120.50\r\n".encode("cp1252"))
+    gui.pick = str(path)
+    gui.import_items()
+    assert gui.imported == []
+    (kind, title, message), = gui.shown
+    assert (kind, title) == ("error", "Import Items") and "excel.csv is not UTF-8" in message
+
+
+def test_unreadable_file_is_reported(gui, tmp_path):
+    gui.pick = str(tmp_path / "gone.csv")
+    gui.import_items()
+    assert gui.imported == []
+    (kind, title, message), = gui.shown
+    assert (kind, title) == ("error", "Import Items") and "Could not read gone.csv" in message
+
+
+def test_cancelled_dialog_does_nothing(gui):
+    gui.import_items()
+    assert gui.imported == [] and gui.shown == []
@@ -0,0 +1,96 @@
+import random
+from decimal import Decimal, ROUND_HALF_UP
+
+import pytest
+
+from invoice_core.money import Money, round_div, scaled
+from invoice_core.totals import (PER_INVOICE, PER_LINE, RunningTotals, compute_lines,
+                                 exact_total, make_line, summarize)
+
+CENT = Decimal("0.01")
+# CGST = SGST = half the GST slab, in percent
+SLABS = ("0", "0.125", "1.5", "2.5", "6", "9", "14")
+
+
+def _r(d: Decimal) -> int:
+    """Decimal rupees -> paise, ROUND_HALF_UP."""
+    return int(d.quantize(CENT, ROUND_HALF_UP) * 100)
+
+
+def _reference(items, cgst, sgst, rounding):
+    """The same invoice worked out in ``Decimal``."""
+    cgst_r, sgst_r = Decimal(cgst) / 100, Decimal(sgst) / 100
+    lines = []
+    for item in items:
+        taxable = Decimal(item["qty"]) * Decimal(item["rate"])
+        c, s = taxable * cgst_r, taxable * sgst_r
+        rounded = (_r(taxable), _r(c), _r(s))
+        amount = sum(rounded) if rounding == PER_LINE else _r(taxable + c + s)
+        lines.append((taxable, c, s) + rounded + (amount,))
+    if rounding == PER_LINE:
+        parts = [sum(ln[i] for ln in lines) for i in (3, 4, 5)]
+    else:
+        parts = [_r(sum((ln[i] for ln in lines), Decimal(0))) for i in (0, 1, 2)]
+    exact = _r(sum((ln[0] + ln[1] + ln[2] for ln in lines), Decimal(0)))
+    return [ln[3:] for ln in lines], tuple(parts) + (sum(parts),), exact
+
+
+def _random_items(rng, n):
+    items = []
+    for _ in range(n):
+        qty = rng.choice((rng.randint(1, 20) * 1000, rng.randint(1, 99999), rng.randint(1, 9999999999)))
+        rate = rng.choice((rng.randint(1, 100000), rng.randint(1, 9999999999), 5, 50, 995))
+        items.append({"desc": "part", "hsn": "8708",
+                      "qty": str(Decimal(qty).scaleb(-3)), "rate": str(Decimal(rate).scaleb(-2))})
+    return items
+
+
+@pytest.mark.parametrize("rounding", (PER_INVOICE, PER_LINE))
+@pytest.mark.parametrize("seed", range(25))
+def test_matches_decimal_round_half_up(seed, rounding):
+    rng = random.Random(seed)
+    for _ in range(20):
+        slab = rng.choice(SLABS)
+        items = _random_items(rng, rng.randint(1, 15))
+        lines, totals = compute_lines(items, slab, slab, rounding)
+        ref_lines, ref_totals, ref_exact = _reference(items, slab, slab, rounding)
+
+        assert [(ln.taxable, ln.cgst, ln.sgst, ln.amount) for ln in lines] == ref_lines
+        assert tuple(totals) == ref_totals
+        assert all(type(v) is Money for v in totals)
+        assert summarize(lines, rounding) == totals
+        assert exact_total(lines) == ref_exact
+
+
+@pytest.mark.parametrize("rounding", (PER_INVOICE, PER_LINE))
+def test_running_totals_add_up_in_any_chunks(rounding):
+    rng = random.Random(7)
+    items = _random_items(rng, 60)
+    lines, totals = compute_lines(items, "9", "9", rounding)
+    running, i = RunningTotals(), 0
+    while i < len(lines):
+        step = rng.randint(1, 7)
+        running, i = running.add(lines[i:i + step]), i + step
+    assert running.totals(rounding) == totals
+
+
+def test_half_paisa_rounds_away_from_zero():
+    # 1 unit at 0.05 rupees taxed at 9 %: 0.45 paise of CGST -> 0 paise,
+    # 10 units: 4.5 paise -> 5
+    assert make_line(1, "", "", 1000, 5, 9000, 9000).cgst == 0
+    assert make_line(1, "", "", 10000, 5, 9000, 9000).cgst == 5
+    assert round_div(-5, 10) == -1 and round_div(5, 10) == 1 and round_div(4, 10) == 0
+
+
+@pytest.mark.parametrize("text,places,expected", [
+    ("12.345", 2, 1235), ("12.344", 2, 1234), ("-0.005", 2, -1), (".5", 0, 1),
+    ("1e2", 2, 10000), (Decimal("2.675"), 2, 268), (7, 3, 7000),
+])
+def test_scaled(text, places, expected):
+    assert scaled(text, places) == expected
+
+
+@pytest.mark.parametrize("bad", ["", "abc", "1.2.3", "--1", "NaN", "Infinity"])
+def test_scaled_rejects(bad):
+    with pytest.raises(ValueError):
+        scaled(bad, 2)
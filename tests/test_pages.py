@@ -0,0 +1,53 @@
+import itertools
+
+import pytest
+
+from invoice_core.pages import Carry, paginate
+from invoice_core.totals import make_line
+
+
+def _lines(n):
+    return [make_line(i, f"item {i}", "8708", 1000, 1000 + i, 9000, 9000) for i in range(1, n + 1)]
+
+
+def _capacity(first, rest, last):
+    def capacity(number, is_last):
+        if is_last:
+            return last
+        return first if number == 1 else rest
+    return capacity
+
+
+def _check(lines, pages):
+    assert [ln for p in pages for ln in p.lines] == lines
+    assert [p.number for p in pages] == list(range(1, len(pages) + 1))
+    assert [p.last for p in pages] == [False] * (len(pages) - 1) + [True]
+    assert pages[0].brought is None
+    for prev, page in zip(pages, pages[1:]):
+        assert page.brought == prev.carried
+    assert pages[-1].carried == Carry().add(lines)
+
+
+def test_last_page_holds_more_than_the_others():
+    lines = _lines(10)
+    pages = list(paginate(iter(lines), _capacity(4, 2, 7)))
+    _check(lines, pages)
+    assert [len(p.lines) for p in pages] == [4, 6]
+
+
+@pytest.mark.parametrize("first,rest,last", list(itertools.product((1, 2, 4, 7), (1, 3, 5), (0, 1, 3, 6, 9))))
+def test_every_line_emitted_exactly_once(first, rest, last):
+    for n in (0, 1, 2, 5, 11, 23):
+        lines = _lines(n)
+        pages = list(paginate(iter(lines), _capacity(first, rest, last)))
+        _check(lines, pages)
+        for p in pages:
+            assert len(p.lines) <= (last if p.last else max(first if p.number == 1 else rest, 1))
+
+
+def test_totals_never_stand_alone():
+    # 4 lines fit a middle page but only 3 fit with the totals: the last
+    # line moves on to the final page
+    lines = _lines(4)
+    pages = list(paginate(lines, _capacity(4, 4, 3)))
+    assert [len(p.lines) for p in pages] == [3, 1]
@@ -0,0 +1,106 @@
+import json
+
+import pytest
+
+from payload import (MAX_ERRORS, InvoiceIn, ItemIn, PayloadError, loads, parse_invoice,
+                     parse_invoices, read_ndjson)
+
+
+def _invoice(**changes):
+    inv = {"customer": {"name": "Ravi Kumar", "phone": "9876543210", "district": "Krishna",
+                        "state": "Andhra Pradesh"},
+           "items": [{"desc": "Brush set", "hsn": "8511", "qty": "2", "rate": "120.50"}]}
+    inv.update(changes)
+    return inv
+
+
+def _errors(data, parse=parse_invoice):
+    with pytest.raises(PayloadError) as e:
+        parse(data)
+    return {(err["path"], err["message"]) for err in e.value.errors}
+
+
+def test_valid_invoice_is_typed_and_scaled():
+    inv = parse_invoice(_invoice(items=[{"desc": " Brush ", "rate": 99.995},
+                                        {"desc": "Oil", "qty": "1.5", "rate": "300"}]))
+    assert isinstance(inv, InvoiceIn) and inv.with_gst is True
+    assert inv.items == (ItemIn("Brush", "", 1000, 10000), ItemIn("Oil", "", 1500, 30000))
+    assert inv.customer["name"] == "Ravi Kumar" and inv.customer["vehicle"] == ""
+
+
+@pytest.mark.parametrize("data,expected", [
+    (None, ("$", "is required")),
+    ([], ("$", "must be an object")),
+    ({"items": [{"desc": "x", "rate": 1}]}, ("customer", "is required")),
+    (_invoice(customer="Ravi"), ("customer", "must be an object")),
+    (_invoice(customer={"name": "  "}), ("customer.name", "is required")),
+    (_invoice(customer={"name": "x" * 101}), ("customer.name", "must be at most 100 characters")),
+    (_invoice(customer={"name": True}), ("customer.name", "must be a string")),
+    (_invoice(customer={"name": "R", "district": "d" * 60, "state": "s" * 40}),
+     ("customer.district", "district and state together are too long")),
+    (_invoice(items=[]), ("items", "must have at least 1 entry")),
+    (_invoice(items={"desc": "x"}), ("items", "must be a list")),
+    (_invoice(items=["x"]), ("items[0]", "must be an object")),
+    (_invoice(items=[{"rate": 1}]), ("items[0].desc", "is required")),
+    (_invoice(items=[{"desc": "x"}]), ("items[0].rate", "is required")),
+    (_invoice(items=[{"desc": "x", "rate": "12,50"}]), ("items[0].rate", "must be a number")),
+    (_invoice(items=[{"desc": "x", "rate": "1e3"}]), ("items[0].rate", "must be a number")),
+    (_invoice(items=[{"desc": "x", "rate": float("nan")}]), ("items[0].rate", "must be a number")),
+    (_invoice(items=[{"desc": "x", "rate": True}]), ("items[0].rate", "must be a number")),
+    (_invoice(items=[{"desc": "x", "rate": "0.004"}]), ("items[0].rate", "must be greater than 0")),
+    (_invoice(items=[{"desc": "x", "rate": 5, "qty": -1}]), ("items[0].qty", "must be greater than 0")),
+    (_invoice(items=[{"desc": "x", "rate": "100000000"}]), ("items[0].rate", "must be at most 99999999.99")),
+    (_invoice(items=[{"desc": "x", "rate": 5, "qty": "10000000"}]),
+     ("items[0].qty", "must be at most 9999999.999")),
+    (_invoice(items=[{"desc": "x", "rate": "99999999", "qty": "1000"}]),
+     ("items[0]", "qty x rate is too large")),
+    (_invoice(with_gst="yes"), ("with_gst", "must be true or false")),
+])
+def test_rejections(data, expected):
+    assert expected in _errors(data)
+
+
+def test_every_problem_is_reported_with_its_path():
+    data = _invoice(customer={"phone": 98}, with_gst=1,
+                    items=[{"desc": "ok", "rate": 1}, {"rate": "abc"}])
+    assert _errors(data) == {
+        ("customer.name", "is required"),
+        ("items[1].desc", "is required"),
+        ("items[1].rate", "must be a number"),
+        ("with_gst", "must be true or false"),
+    }
+
+
+def test_error_count_is_capped():
+    data = _invoice(items=[{"rate": "bad"}] * 100)
+    with pytest.raises(PayloadError) as e:
+        parse_invoice(data)
+    assert len(e.value.errors) == MAX_ERRORS
+    assert e.value.body()["error"] == "Invalid invoice payload"
+
+
+def test_batches():
+    assert len(parse_invoices([_invoice(), _invoice()])) == 2
+    assert len(parse_invoices({"invoices": [_invoice()]})) == 1
+    assert ("invoices", "must have at least 1 entry") in _errors({"invoices": []}, parse_invoices)
+    assert ("invoices[1].customer", "is required") in _errors(
+        {"invoices": [_invoice(), {"items": []}]}, parse_invoices)
+
+
+def test_bad_json():
+    with pytest.raises(PayloadError) as e:
+        loads(b"{not json")
+    assert e.value.errors[0]["path"] == "$"
+    assert e.value.errors[0]["message"].startswith("not valid JSON")
+
+
+def test_ndjson_stops_at_the_first_bad_line():
+    def lines():
+        yield json.dumps(_invoice())
+        yield ""
+        yield json.dumps(_invoice(items=[]))
+        raise AssertionError("read past the bad line")
+    with pytest.raises(PayloadError) as e:
+        read_ndjson(lines())
+    assert e.value.errors == [{"path": "items", "message": "must have at least 1 entry", "line": 3}]
+    assert _errors(["", " "], read_ndjson) == {("$", "no invoices in the request body")}
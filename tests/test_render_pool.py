@@ -0,0 +1,44 @@
+import glob
+import json
+import multiprocessing
+import os
+from datetime import date
+
+import pytest
+
+from invoice_core.invoice import build_invoice
+from metrics import METRICS
+from render import invoice_lines
+from render_pool import RenderEngine
+
+CUSTOMER = {"name": "Ravi Kumar", "phone": "9876543210", "address": "12-4 Main Rd",
+            "district": "Krishna, Andhra Pradesh", "state": "", "vehicle": "AP16 TX 1234",
+            "jobcard": "JC-77"}
+
+
+def _invoice():
+    lines, _ = invoice_lines(
+        [{"desc": "Alternator brush set", "hsn": "8511", "qty": "2", "rate": "120.50"}], True)
+    return build_invoice("0042", CUSTOMER, lines, date=date(2026, 10, 18))
+
+
+@pytest.mark.parametrize("method", [m for m in ("spawn", "forkserver")
+                                    if m in multiprocessing.get_all_start_methods()])
+def test_pool_workers_report_metrics_without_fork(method, tmp_path, monkeypatch):
+    # the workers learn the metrics directory from the pool, not from fork
+    monkeypatch.setattr(METRICS, "directory", str(tmp_path))
+    engine = RenderEngine(workers=1, mp_context=multiprocessing.get_context(method))
+    try:
+        engine.acquire()
+        pdf = engine.render(_invoice())
+    finally:
+        engine.shutdown()
+    assert pdf.startswith(b"%PDF")
+
+    workers = [path for path in glob.glob(os.path.join(str(tmp_path), "*.json"))
+               if os.path.basename(path) != f"{os.getpid()}.json"]
+    assert len(workers) == 1
+    with open(workers[0]) as f:
+        data = json.load(f)
+    assert data["counters"]["pdf_bytes_total"] == len(pdf)
+    assert {"build_pdf", "letterhead", "table", "save"} <= set(data["hist"])
@@ -0,0 +1,134 @@
+import io
+import re
+from datetime import date
+
+import pytest
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+import render
+from invoice_core.money import money
+from invoice_core.pages import Carry, Page
+from render import (CELL_PAD, ITEMS_GST, ITEMS_PLAIN, ROW_BASELINE, ROW_HEIGHT, TOTALS,
+                    TOTALS_LAST_ROW, TOTALS_ROW, _draw_items_table, _draw_totals,
+                    _text_width, _totals_height, _totals_rows, invoice_lines)
+
+CELL = re.compile(r"1 0 0 1 (-?[\d.]+) (-?[\d.]+) Tm \((.*?)\) Tj")
+
+ITEMS = [
+    {"desc": "Alternator brush set", "hsn": "8511", "qty": "2", "rate": "120.50"},
+    {"desc": "Starter motor solenoid, heavy duty, for 12 V commercial vehicles",
+     "hsn": "8511", "qty": "1.5", "rate": "1499.99"},
+    {"desc": "Labour", "hsn": "9987", "qty": "1", "rate": "350"},
+]
+
+
+def _canvas():
+    return canvas.Canvas(io.BytesIO(), pagesize=letter)
+
+
+def _cells(c):
+    """``{text: (x, y)}`` for every cell drawn on the fast path."""
+    return {text: (float(x), float(y)) for x, y, text in CELL.findall(" ".join(c._code))}
+
+
+def _page(lines, last=True, brought=None):
+    return Page(2 if brought else 1, tuple(lines), brought,
+                (brought or Carry()).add(lines), last)
+
+
+@pytest.mark.parametrize("with_gst", (True, False))
+def test_item_rows_land_in_their_columns(with_gst):
+    lines, _ = invoice_lines(ITEMS, with_gst)
+    layout = ITEMS_GST if with_gst else ITEMS_PLAIN
+    c, x, top = _canvas(), 30, 500
+    height = _draw_items_table(c, _page(lines), with_gst, x, top)
+    assert height == (len(lines) + 1) * ROW_HEIGHT
+
+    cells = _cells(c)
+    for header in layout.headers:
+        assert cells[header][1] == pytest.approx(top - ROW_HEIGHT + ROW_BASELINE, abs=0.01)
+    amount_col = len(layout.widths) - 1
+    right = x + layout.edges[amount_col + 1] - CELL_PAD
+    for row, ln in enumerate(lines, 2):
+        ax, ay = cells[money(ln.amount)]
+        assert ay == pytest.approx(top - row * ROW_HEIGHT + ROW_BASELINE, abs=0.01)
+        # right-aligned: the text ends one cell pad short of the column edge
+        assert ax + _text_width(money(ln.amount), "Helvetica") == pytest.approx(right, abs=0.01)
+        if with_gst:
+            assert money(ln.cgst) in cells and money(ln.taxable) in cells
+    assert "Labour" in cells and "1.5" in cells
+
+
+def test_long_descriptions_are_cut_to_the_column():
+    lines, _ = invoice_lines(ITEMS, True)
+    c = _canvas()
+    _draw_items_table(c, _page(lines), True, 30, 500)
+    cut = [t for t in _cells(c) if t.startswith("Starter motor")]
+    assert len(cut) == 1 and cut[0] != ITEMS[1]["desc"]
+    # the ellipsis is cp1252 0x85, written as an octal escape
+    text = cut[0].replace("\\205", "…")
+    assert text.endswith("…")
+    assert _text_width(text, "Helvetica") <= ITEMS_GST.widths[1] - 2 * CELL_PAD
+
+
+def test_continuation_pages_carry_totals_forward():
+    lines, _ = invoice_lines(ITEMS * 3, True)
+    brought = Carry().add(lines[:4])
+    page = _page(lines[4:7], last=False, brought=brought)
+    c = _canvas()
+    height = _draw_items_table(c, page, True, 30, 500)
+    assert height == (3 + 2 + 1) * ROW_HEIGHT             # lines, brought + carried, header
+    cells = _cells(c)
+    assert cells["Brought forward"][1] == pytest.approx(500 - 2 * ROW_HEIGHT + ROW_BASELINE, abs=0.01)
+    assert cells["Carried forward"][1] == pytest.approx(500 - 6 * ROW_HEIGHT + ROW_BASELINE, abs=0.01)
+    assert money(brought.amount) in cells
+    assert money(page.carried.amount) in cells
+    assert page.carried == Carry().add(lines[:7])
+
+
+@pytest.mark.parametrize("with_gst", (True, False))
+def test_totals_block(with_gst):
+    _, totals = invoice_lines(ITEMS, with_gst)
+    rows = _totals_rows(totals, with_gst)
+    labels = [r[0] for r in rows]
+    if with_gst:
+        assert labels == ["Subtotal", "CGST @ 9%", "SGST @ 9%", "Grand Total"]
+        assert rows[0][1] == money(totals.taxable) and rows[1][1] == money(totals.cgst)
+    else:
+        assert labels == ["Grand Total"]
+    assert rows[-1][1] == money(totals.total)
+    assert _totals_height(rows) == (len(rows) - 1) * TOTALS_ROW + TOTALS_LAST_ROW
+
+    c, x, y = _canvas(), 350, 200
+    _draw_totals(c, rows, x, y)
+    cells = _cells(c)
+    right = x + TOTALS.width - CELL_PAD
+    gx, gy = cells["Grand Total"]
+    assert gy == y + render.TOTALS_LAST_BASELINE
+    assert gx + _text_width("Grand Total", "Helvetica-Bold") == pytest.approx(
+        x + TOTALS.edges[1] - CELL_PAD, abs=0.01)
+    tx, _ = cells[money(totals.total)]
+    assert tx + _text_width(money(totals.total), "Helvetica-Bold") == pytest.approx(right, abs=0.01)
+    if with_gst:
+        # top row first, a row pitch apart
+        ys = [cells[label][1] for label in labels[:-1]]
+        assert ys == sorted(ys, reverse=True)
+        assert ys[0] - ys[1] == pytest.approx(TOTALS_ROW)
+
+
+def test_build_pdf_prints_every_line_and_the_totals():
+    pypdf = pytest.importorskip("pypdf")
+    items = [{"desc": f"Part {i:03}", "hsn": "8708", "qty": "1", "rate": f"{10 + i}.25"}
+             for i in range(70)]
+    lines, totals = invoice_lines(items, True)
+    cust = {"name": "Ravi Kumar", "phone": "9876543210", "address": "12-4 Main Rd",
+            "district": "Krishna", "state": "Andhra Pradesh", "vehicle": "AP16 TX 1234",
+            "jobcard": "JC-77"}
+    pdf = render.build_pdf("0042", cust, iter(lines), totals, True, date(2026, 10, 18))
+    pages = [p.extract_text() for p in pypdf.PdfReader(io.BytesIO(pdf)).pages]
+    assert len(pages) > 1
+    text = "\n".join(pages)
+    assert all(f"Part {i:03}" in text for i in range(70))
+    assert money(totals.total) in pages[-1]
+    assert "Carried forward" in pages[0] and "Brought forward" in pages[1]
@@ -0,0 +1,43 @@
+from benchmarks.synthetic import make_invoice
+
+
+def _generate(web, payload):
+    client = web.APP.test_client()
+    r = client.post("/generate", json=payload)
+    assert r.status_code == 200, r.data
+    with web.APP.app_context():
+        return web.Invoice.query.order_by(web.Invoice.id.desc()).first().invoice_no
+
+
+def _reprint_key(web, inv_no):
+    with web.APP.app_context():
+        desc = web._load_description(inv_no)
+    return desc, web._cache_key(desc)
+
+
+def test_reprint_keeps_the_customer_as_billed(web, empty_db):
+    first = make_invoice(3, True, seed=1)
+    first["customer"].update(phone="9000000001", address="old addr", vehicle="AP16 1111")
+    inv_no = _generate(web, first)
+    before, key = _reprint_key(web, inv_no)
+
+    second = make_invoice(2, True, seed=2)
+    second["customer"].update(phone="+91 90000 00001", address="new addr", vehicle="AP16 9999")
+    _generate(web, second)
+
+    after, key_after = _reprint_key(web, inv_no)
+    assert after.customer["address"] == "old addr" and after.customer["vehicle"] == "AP16 1111"
+    assert (after, key_after) == (before, key)
+    # the PDF served by /generate is the one found again
+    assert web.PDF_CACHE.get(key) is not None
+
+
+def test_reprint_keeps_the_gst_layout_when_no_tax_was_due(web, empty_db):
+    # 9% of 5 paise rounds to nothing: a GST invoice with zero CGST/SGST
+    payload = make_invoice(1, True, seed=3)
+    payload["items"] = [{"desc": "Washer", "hsn": "7318", "qty": "1", "rate": "0.05"}]
+    inv_no = _generate(web, payload)
+    desc, key = _reprint_key(web, inv_no)
+    assert desc.with_gst is True
+    assert desc.totals.cgst == 0 and desc.totals.sgst == 0
+    assert web.PDF_CACHE.get(key) is not None
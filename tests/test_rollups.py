@@ -0,0 +1,90 @@
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import delete, func, select
+
+from benchmarks.synthetic import make_invoice
+from invoice_core.money import money
+
+DAYS = [date(2026, 9, 1) + timedelta(days=d) for d in (0, 0, 1, 3, 3, 3, 7, 30)]
+
+
+@pytest.fixture
+def saved(web, empty_db):
+    """Invoices over a few days, some for the same customer, some without GST."""
+    with web.APP.app_context():
+        for i, day in enumerate(DAYS):
+            p = make_invoice(3 + i, with_gst=i % 3 != 2, seed=i)
+            if i % 2:
+                p["customer"]["phone"] = "+91 90000 00001"
+            inv = web.parse_invoice(p)
+            lines, totals = web.item_lines(inv.items, inv.with_gst, web.APP.config['GST_ROUNDING'])
+            web._save_invoice(f"{i + 1:04}", inv.customer, lines, totals, inv.with_gst, day)
+        web.db.session.commit()
+        yield web
+
+
+def _rollup_rows(web):
+    return [sorted(web.db.session.execute(select(t)).all())
+            for t in (web.GstDaily.__table__, web.GstHsnDaily.__table__)]
+
+
+def test_rebuild_matches_incremental(saved):
+    web = saved
+    with web.APP.app_context():
+        incremental = _rollup_rows(web)
+    assert all(incremental)
+    result = web.APP.test_cli_runner().invoke(args=["rebuild-gst-rollups"])
+    assert result.exception is None, result.output
+    with web.APP.app_context():
+        assert _rollup_rows(web) == incremental
+
+
+def test_generic_upsert_matches_native(saved):
+    web = saved
+    with web.APP.app_context():
+        native = _rollup_rows(web)
+        conn = web.db.session.connection()
+        for t in (web.GstDaily.__table__, web.GstHsnDaily.__table__):
+            conn.execute(delete(t))
+        rollups = web.GstRollups(web.GstDaily.__table__, web.GstHsnDaily.__table__,
+                                 web.Customer.__table__)
+        for t in (rollups.daily, rollups.hsn):
+            rollups._statements[conn.dialect.name, t.name] = None   # as on a backend without upserts
+        for invoice in web._saved_invoices():
+            rollups.add(conn, *invoice)
+        assert _rollup_rows(web) == native
+        web.db.session.rollback()
+
+
+def test_reports_add_up_to_the_invoices(saved):
+    web = saved
+    client = web.APP.test_client()
+    with web.APP.app_context():
+        I = web.Invoice
+        count, taxable, cgst, sgst, total = web.db.session.execute(
+            select(func.count(), func.sum(I.subtotal), func.sum(I.cgst),
+                   func.sum(I.sgst), func.sum(I.total))).one()
+    expected = {"taxable": f"{taxable:.2f}", "cgst": f"{cgst:.2f}", "sgst": f"{sgst:.2f}",
+                "total": f"{total:.2f}"}
+    for group in ("day", "customer"):
+        r = client.get(f"/reports/gst?from=2026-09-01&to=2026-10-31&group={group}")
+        assert r.status_code == 200
+        assert r.json["totals"] == expected
+        assert sum(row["invoices"] for row in r.json["rows"]) == count
+    days = client.get("/reports/gst?from=2026-09-01&to=2026-09-04&group=day").json["rows"]
+    assert [(row["date"], row["invoices"]) for row in days] == [
+        ("2026-09-01", 2), ("2026-09-02", 1), ("2026-09-04", 3)]
+    hsn = client.get("/reports/gst?from=2026-09-01&to=2026-10-31&group=hsn").json
+    assert [row["hsn"] for row in hsn["rows"]] == sorted(row["hsn"] for row in hsn["rows"])
+    # HSN rows add up the line amounts as printed, rounded per line
+    with web.APP.app_context():
+        lines = [ln for _, _, inv_lines, _ in web._saved_invoices() for ln in inv_lines]
+    assert hsn["totals"]["taxable"] == money(sum(int(ln.taxable) for ln in lines))
+    assert hsn["totals"]["cgst"] == money(sum(int(ln.cgst) for ln in lines))
+    assert sum(row["lines"] for row in hsn["rows"]) == len(lines)
+
+
+@pytest.mark.parametrize("query", ["group=x", "from=2026-13-01", "from=2026-02-01&to=2026-01-01"])
+def test_report_rejects_bad_queries(saved, query):
+    assert saved.APP.test_client().get(f"/reports/gst?{query}").status_code == 400
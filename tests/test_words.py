@@ -0,0 +1,63 @@
+import random
+from decimal import Decimal
+
+import pytest
+
+from invoice_core.words import amount_in_words, cardinal, rupees_in_words
+
+# every group boundary: below, at and just above it
+BOUNDARIES = sorted({b + d for b in (100, 1000, 10 ** 5, 10 ** 7, 10 ** 9, 10 ** 10)
+                     for d in (-1, 0, 1)})
+
+
+@pytest.mark.parametrize("n,words", [
+    (0, "zero"),
+    (19, "nineteen"),
+    (21, "twenty-one"),
+    (101, "one hundred and one"),
+    (1001, "one thousand and one"),
+    (1100, "one thousand, one hundred"),
+    (99999, "ninety-nine thousand, nine hundred and ninety-nine"),
+    (100000, "one lakh"),
+    (100001, "one lakh and one"),
+    (110000, "one lakh, ten thousand"),
+    (9999999, "ninety-nine lakh, ninety-nine thousand, nine hundred and ninety-nine"),
+    (10000000, "one crore"),
+    (10000001, "one crore and one"),
+    (12345678, "one crore, twenty-three lakh, forty-five thousand, six hundred and seventy-eight"),
+    (10 ** 10, "one thousand crore"),
+    (123456789012, "twelve thousand, three hundred and forty-five crore, "
+                   "sixty-seven lakh, eighty-nine thousand and twelve"),
+])
+def test_cardinal(n, words):
+    assert cardinal(n) == words
+
+
+@pytest.mark.parametrize("paise,words", [
+    (0, "zero rupees, zero paise"),
+    (1, "zero rupees, one paisa"),
+    (99, "zero rupees, ninety-nine paise"),
+    (100, "one rupee, zero paise"),
+    (101, "one rupee, one paisa"),
+    (10000000 * 100 + 50, "one crore rupees, fifty paise"),
+    (-250, "minus two rupees, fifty paise"),
+])
+def test_rupees_and_paise(paise, words):
+    assert rupees_in_words(paise) == words
+
+
+def test_invoice_line_is_title_case():
+    assert amount_in_words(1234567) == ("Twelve Thousand, Three Hundred And Forty-Five "
+                                        "Rupees, Sixty-Seven Paise Only")
+
+
+def test_same_wording_as_num2words():
+    num2words = pytest.importorskip("num2words").num2words
+    rng = random.Random(22)
+    # num2words stops below 10**10 rupees
+    rupees = [n for n in BOUNDARIES if n < 10 ** 10] + \
+             [rng.randint(0, 10 ** rng.randint(1, 10) - 1) for _ in range(500)]
+    for r in rupees:
+        for p in (r * 100, r * 100 + 1, r * 100 + 99):
+            expected = num2words(Decimal(p).scaleb(-2), lang="en_IN", to="currency", currency="INR")
+            assert rupees_in_words(p) == expected, p